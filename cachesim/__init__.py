@@ -0,0 +1,8 @@
+"""
+Shared cache-simulation helpers used by the tutorial scripts.
+
+Importing the package runs no simulation and does not load matplotlib; plotting lives
+in cachesim.plotting and imports it only when a figure is drawn.
+"""
+from cachesim.fully_associative import FullyAssociativeCache
+from cachesim.multilevel import CacheHierarchySimulator, MultiLevelCacheSimulator, build_hierarchy
@@ -0,0 +1,106 @@
+"""
+Vectorized access-pattern generators.
+
+Every generator returns a contiguous int64 NumPy array of word addresses. Randomness
+comes from a numpy.random.Generator: pass either a seed or an existing Generator as
+`seed`, so the same seed always reproduces the same trace.
+"""
+import numpy as np
+
+READ = 0
+WRITE = 1
+OPERATION_NAMES = ('read', 'write')
+
+# Which prefetch stream an access belongs to (MultiLevelCacheSimulator); NONE = unknown.
+STREAM_NONE = 0
+STREAM_INSTRUCTION = 1
+STREAM_DATA = 2
+
+
+def make_rng(seed=None):
+    """Return a numpy Generator; an existing Generator is passed through unchanged."""
+    return np.random.default_rng(seed)
+
+
+def spatial_accesses(num_accesses, start_address=0, step=1):
+    """Spatially contiguous addresses: start, start + step, start + 2*step, ..."""
+    return np.arange(start_address, start_address + num_accesses * step, step, dtype=np.int64)
+
+
+def temporal_accesses(num_accesses, base_addresses=(20, 21, 22, 23, 24, 25), hot_prob=0.98,
+                      cold_start=10000, cold_step=1, seed=None):
+    """
+    Mix frequent (hot) accesses with occasional (cold) ones.
+    With probability hot_prob an access picks one of base_addresses; otherwise it goes
+    to the next never-seen cold address (cold_start, cold_start + cold_step, ...).
+    """
+    rng = make_rng(seed)
+    hot = rng.random(num_accesses) < hot_prob
+    accesses = np.asarray(base_addresses, dtype=np.int64)[rng.integers(0, len(base_addresses), num_accesses)]
+    cold = ~hot
+    accesses[cold] = cold_start + cold_step * np.arange(np.count_nonzero(cold), dtype=np.int64)
+    return accesses
+
+
+def random_accesses(num_accesses, memory_size_words, align=1, seed=None):
+    """Uniformly random addresses in [0, memory_size_words), rounded down to a multiple of align."""
+    rng = make_rng(seed)
+    accesses = rng.integers(0, memory_size_words - align + 1, num_accesses, dtype=np.int64)
+    if align > 1:
+        accesses -= accesses % align
+    return accesses
+
+
+def zipf_accesses(num_accesses, num_blocks, exponent=1.0, block_size_words=16, start_address=0, seed=None):
+    """
+    Block-aligned addresses whose popularity follows a bounded Zipf law: the k-th most
+    popular of num_blocks blocks is chosen with probability proportional to 1 / k**exponent.
+    Popularity ranks are assigned to blocks in random order.
+    """
+    rng = make_rng(seed)
+    weights = 1.0 / np.arange(1, num_blocks + 1, dtype=np.float64) ** exponent
+    ranks = rng.choice(num_blocks, size=num_accesses, p=weights / weights.sum())
+    blocks = rng.permutation(num_blocks)[ranks]
+    return start_address + blocks.astype(np.int64) * block_size_words
+
+
+def strided_accesses(num_accesses, stride, start_address=0, memory_size_words=None):
+    """Fixed-stride sweep, wrapping around memory_size_words when given."""
+    accesses = start_address + np.arange(num_accesses, dtype=np.int64) * stride
+    if memory_size_words is not None:
+        accesses %= memory_size_words
+    return accesses
+
+
+def pointer_chase_accesses(num_accesses, num_nodes, node_size_words=16, start_address=0, seed=None):
+    """
+    Follow a linked list whose num_nodes nodes are laid out in random order.
+    The list is a single cycle, so the walk visits every node before repeating and
+    consecutive accesses never share spatial locality.
+    """
+    rng = make_rng(seed)
+    order = rng.permutation(num_nodes).astype(np.int64)
+    return start_address + order[np.arange(num_accesses) % num_nodes] * node_size_words
+
+
+def operation_sequence(num_accesses, write_ratio=0.0, seed=None):
+    """uint8 operation codes (READ or WRITE), each a write with probability write_ratio."""
+    rng = make_rng(seed)
+    return (rng.random(num_accesses) < write_ratio).astype(np.uint8)
+
+
+def stream_sequence(num_accesses, instruction_ratio=0.5, operations=None, seed=None):
+    """
+    uint8 stream ids, each STREAM_INSTRUCTION with probability instruction_ratio and
+    STREAM_DATA otherwise. Writes (WRITE in operations, if given) are always data.
+    """
+    rng = make_rng(seed)
+    instruction = rng.random(num_accesses) < instruction_ratio
+    if operations is not None:
+        instruction &= np.asarray(operations) == READ
+    return np.where(instruction, STREAM_INSTRUCTION, STREAM_DATA).astype(np.uint8)
+
+
+def operation_names(operations):
+    """Turn operation codes into the 'read'/'write' strings the simulators take."""
+    return [OPERATION_NAMES[op] for op in np.asarray(operations).tolist()]
@@ -0,0 +1,261 @@
+"""
+Throughput benchmarks for the simulators, with a JSON history and regression check.
+
+Each benchmark reports a rate (simulated accesses/sec for the caches, simulated
+cycles/sec for the processors) and the peak memory traced by tracemalloc. Timing and
+memory come from separate runs, since tracemalloc itself slows the code down.
+
+    python -m cachesim.bench                     # run, append to bench_history.json
+    python -m cachesim.bench --set-baseline      # ... and make this run the baseline
+    python -m cachesim.bench --threshold 0.10    # flag anything >10% slower than baseline
+
+Any benchmark slower than the baseline by more than the threshold is reported, and
+the command then exits with status 1.
+"""
+import argparse
+import contextlib
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from cachesim.access_patterns import random_accesses, temporal_accesses
+from cachesim.fully_associative import FullyAssociativeCache
+from cachesim.multilevel import MultiLevelCacheSimulator
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FULLY_ASSOCIATIVE_POLICIES = ['FIFO', 'LRU', 'Random', 'CLOCK', 'LFU', 'ARC', 'OPT']
+DEFAULT_ACCESS_SIZES = [10000, 100000]
+DEFAULT_PROGRAM_SIZES = [50, 200]
+
+
+def load_tutorial_module(tutorial, name):
+    """Import tutorial_N/<name>.py under a unique module name (every tutorial has a main.py)."""
+    path = os.path.join(REPO_ROOT, tutorial, name + '.py')
+    spec = importlib.util.spec_from_file_location(f'{tutorial}_{name}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ============================================================
+# Benchmark cases: setup() builds fresh state, returns run() -> units done
+# ============================================================
+def fully_associative_case(policy, num_accesses):
+    trace = random_accesses(num_accesses, 64 * 1024, seed=num_accesses).tolist()
+
+    def setup():
+        random.seed(0)
+        cache = FullyAssociativeCache(2048, 16, replacement_policy=policy)
+        return lambda: cache.stream_accesses(trace)['searches']
+    return setup
+
+
+def multilevel_case(num_accesses, pattern='random'):
+    """The default (Tutorial 3) hierarchy on random reads, or on temporal ones that mostly hit L1."""
+    if pattern == 'temporal':
+        trace = temporal_accesses(num_accesses, seed=num_accesses).tolist()
+    else:
+        trace = random_accesses(num_accesses, 64 * 1024, align=16, seed=num_accesses).tolist()
+
+    def setup():
+        simulator = MultiLevelCacheSimulator(seed=0)
+
+        def run():
+            access = simulator.access
+            for address in trace:
+                access(address, 'read')
+            return len(trace)
+        return run
+    return setup
+
+
+def vliw_program(num_instructions, seed=0):
+    """Random tutorial_4 program text: loads, stores, integer/FP arithmetic and logic."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(num_instructions):
+        r = [rng.randrange(16) for _ in range(3)]
+        f = [rng.randrange(16) for _ in range(3)]
+        lines.append(rng.choice([
+            f"LD R{r[0]}, M{rng.randrange(10)}",
+            f"SD R{r[0]}, M{rng.randrange(10)}",
+            f"ADD R{r[0]}, R{r[1]}, R{r[2]}",
+            f"MUL R{r[0]}, R{r[1]}, R{r[2]}",
+            f"FADD F{f[0]}, F{f[1]}, F{f[2]}",
+            f"FMUL F{f[0]}, F{f[1]}, F{f[2]}",
+            f"AND R{r[0]}, R{r[1]}, R{r[2]}",
+            "NOP",
+        ]))
+    return '\n'.join(lines) + '\n'
+
+
+def vliw_case(num_instructions):
+    processor_module = load_tutorial_module('tutorial_4', 'main')
+    program = vliw_program(num_instructions)
+
+    def setup():
+        processor = processor_module.Processor()
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write(program)
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                processor.load_program(f.name)
+        finally:
+            os.unlink(f.name)
+
+        def run():
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                processor.simulate()
+            return processor.current_cycle
+        return run
+    return setup
+
+
+def tomasulo_case(num_instructions):
+    tomasulo = load_tutorial_module('tutorial_5', 'main')
+    rng = random.Random(0)
+    program = []
+    for _ in range(num_instructions):
+        op = rng.choice(['LD', 'ST', 'IADD', 'ISUB', 'IMUL', 'FADD', 'FMUL', 'AND'])
+        if op == 'LD':
+            program.append(tomasulo.Instruction(op, dst=rng.randrange(32), mem_addr=rng.randrange(200)))
+        elif op == 'ST':
+            program.append(tomasulo.Instruction(op, src1=rng.randrange(32), mem_addr=rng.randrange(200)))
+        else:
+            program.append(tomasulo.Instruction(op, dst=rng.randrange(32), src1=rng.randrange(32),
+                                                src2=rng.randrange(32)))
+
+    def setup():
+        processor = tomasulo.TomasuloProcessor()
+        for i in range(200):
+            processor.memory.data[i] = i * 2 + 10
+        # Instructions record their cycles as they run, so every run gets fresh copies.
+        processor.load_program([tomasulo.Instruction(i.op, i.dst, i.src1, i.src2, i.mem_addr) for i in program])
+
+        def run():
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                processor.run(max_cycles=100 * num_instructions)
+            return processor.cycle
+        return run
+    return setup
+
+
+def benchmark_cases(access_sizes=DEFAULT_ACCESS_SIZES, program_sizes=DEFAULT_PROGRAM_SIZES):
+    """(name, unit, setup) for every benchmark."""
+    cases = []
+    for n in access_sizes:
+        for policy in FULLY_ASSOCIATIVE_POLICIES:
+            cases.append((f'FullyAssociativeCache[{policy}] n={n}', 'accesses/s', fully_associative_case(policy, n)))
+        cases.append((f'MultiLevelCacheSimulator.access n={n}', 'accesses/s', multilevel_case(n)))
+        cases.append((f'MultiLevelCacheSimulator.access[temporal] n={n}', 'accesses/s', multilevel_case(n, 'temporal')))
+    for n in program_sizes:
+        cases.append((f'tutorial_4 Processor.simulate n={n}', 'cycles/s', vliw_case(n)))
+        cases.append((f'tutorial_5 TomasuloProcessor.run n={n}', 'cycles/s', tomasulo_case(n)))
+    return cases
+
+
+# ============================================================
+# Measurement, history and regression check
+# ============================================================
+def measure(setup, repeats=3):
+    """Best rate over `repeats` timed runs, plus peak traced memory of one more run."""
+    best = 0.0
+    for _ in range(repeats):
+        run = setup()
+        start = time.perf_counter()
+        units = run()
+        elapsed = time.perf_counter() - start
+        best = max(best, units / elapsed if elapsed > 0 else 0.0)
+    run = setup()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'rate': best, 'peak_bytes': peak}
+
+
+def run_benchmarks(cases, repeats=3, only=None):
+    results = {}
+    for name, unit, setup in cases:
+        if only and only not in name:
+            continue
+        result = measure(setup, repeats)
+        result['unit'] = unit
+        results[name] = result
+        print(f"{name:<48} {result['rate']:>14,.0f} {unit:<11} peak {result['peak_bytes'] / 1024:>10,.1f} KiB")
+    return results
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return {'baseline': None, 'runs': []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_history(path, history):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(history, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def find_regressions(results, baseline, threshold):
+    """(name, baseline rate, rate) for every benchmark slower than baseline by more than threshold."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline['results'].get(name)
+        if reference and result['rate'] < reference['rate'] * (1 - threshold):
+            regressions.append((name, reference['rate'], result['rate']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark simulator throughput against a stored baseline.")
+    parser.add_argument('--history', default='bench_history.json', help="JSON file holding past runs")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="report slowdowns beyond this fraction of the baseline rate")
+    parser.add_argument('--set-baseline', action='store_true', help="make this run the baseline")
+    parser.add_argument('--repeats', type=int, default=3, help="timed runs per benchmark (best is kept)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_ACCESS_SIZES,
+                        help="trace lengths for the cache benchmarks")
+    parser.add_argument('--program-sizes', type=int, nargs='+', default=DEFAULT_PROGRAM_SIZES,
+                        help="instruction counts for the processor benchmarks")
+    parser.add_argument('--only', help="run only benchmarks whose name contains this text")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(benchmark_cases(args.sizes, args.program_sizes), args.repeats, args.only)
+    history = load_history(args.history)
+    run = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    history['runs'].append(run)
+    if args.set_baseline or history['baseline'] is None:
+        history['baseline'] = len(history['runs']) - 1
+        print(f"Baseline set to this run ({run['timestamp']}).")
+    save_history(args.history, history)
+
+    baseline = history['runs'][history['baseline']]
+    regressions = find_regressions(results, baseline, args.threshold)
+    for name, reference, rate in regressions:
+        print(f"REGRESSION {name}: {rate:,.0f} vs baseline {reference:,.0f} ({rate / reference - 1:+.1%})")
+    if regressions:
+        sys.exit(1)
+    if baseline is not run:
+        print(f"No slowdowns beyond {args.threshold:.0%} against the baseline of {baseline['timestamp']}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+Frame pacing for the GUI simulations.
+
+In fast-forward mode a GUI simulates a batch of accesses per frame and redraws once
+at the end of it. FrameBudget picks the batch size: it times each batch and scales
+the next one so that simulating takes about target_ms, leaving the rest of the frame
+for drawing. Headless runs use the same batches, just without the drawing.
+"""
+import time
+
+DEFAULT_TARGET_MS = 20
+MAX_GROWTH = 2.0  # The batch at most doubles (or halves) from one frame to the next.
+
+
+class FrameBudget:
+    def __init__(self, target_ms=DEFAULT_TARGET_MS, initial=1, maximum=1 << 20):
+        self.target = target_ms / 1000
+        self.batch = initial
+        self.maximum = maximum
+
+    def run(self, step, remaining):
+        """Call step(k) for this frame's batch (at most `remaining`), adapt the batch size, return k."""
+        count = min(self.batch, remaining)
+        start = time.perf_counter()
+        step(count)
+        elapsed = time.perf_counter() - start
+        if count == self.batch:
+            scale = self.target / elapsed if elapsed > 0 else MAX_GROWTH
+            scale = min(MAX_GROWTH, max(1 / MAX_GROWTH, scale))
+            self.batch = max(1, min(self.maximum, int(count * scale)))
+        return count
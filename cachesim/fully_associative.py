@@ -0,0 +1,347 @@
+"""
+Fully associative cache simulator (Tutorial 1) with FIFO, LRU, Random and OPT replacement,
+plus the pluggable policies in cachesim.policies (CLOCK, LFU, ARC).
+"""
+import heapq
+import random
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from cachesim.access_patterns import WRITE, operation_names
+from cachesim.policies import REPLACEMENT_POLICIES
+
+
+class CacheLine:
+    def __init__(self, tag=None, valid=False, dirty=False):
+        self.tag = tag
+        self.valid = valid
+        self.dirty = dirty
+        self.lru_counter = 0  # For LRU replacement
+
+class FullyAssociativeCache:
+    def __init__(self, cache_size_words, block_size_words, replacement_policy='FIFO'):
+        self.cache_size_lines = cache_size_words // block_size_words
+        self.block_size_words = block_size_words
+        self.replacement_policy = replacement_policy
+        # Line state is kept as parallel arrays (struct of arrays) and updated in place,
+        # so a fill never allocates. Lines stay in their slot once filled; the tag index
+        # keeps LRU recency order (least recent first) and FIFO walks the slots as a ring.
+        self._allocate_lines()
+        self.tag_index = OrderedDict()  # tag -> index of the valid line holding it
+        self.fifo_pointer = 0  # Next slot to evict under FIFO
+        self.cache_lines_used = 0
+        self.misses = 0
+        self.searches = 0
+        self.hits = 0
+        self.lru_counter = 0  # Global counter for LRU
+        # OPT (Belady's MIN) is offline: next_use[i] is the position of the next access to
+        # the block touched by access i, filled in by plan_opt() from the whole trace.
+        self.next_use = None
+        self.opt_heap = []  # (-next use, slot), a max-heap with stale entries skipped lazily
+        self.opt_base = 0  # Value of self.searches when the plan was made
+        self.policy = self._make_policy()
+
+    def _make_policy(self):
+        """Policy object for the pluggable policies; None for the built-in ones."""
+        policy_class = REPLACEMENT_POLICIES.get(self.replacement_policy)
+        return policy_class(self.cache_size_lines) if policy_class else None
+
+    def _allocate_lines(self):
+        self.tags = array('q', [-1]) * self.cache_size_lines
+        self.lru_stamps = array('q', [0]) * self.cache_size_lines
+        self.line_next_use = array('q', [0]) * self.cache_size_lines
+        self.valid = bytearray(self.cache_size_lines)
+        self.dirty = bytearray(self.cache_size_lines)
+
+    @property
+    def cache(self):
+        """CacheLine snapshots of every slot, built on demand for inspection and printing."""
+        lines = []
+        for i in range(self.cache_size_lines):
+            line = CacheLine(tag=self.tags[i] if self.valid[i] else None,
+                             valid=bool(self.valid[i]), dirty=bool(self.dirty[i]))
+            line.lru_counter = self.lru_stamps[i]
+            lines.append(line)
+        return lines
+
+    def address_breakdown(self, address):
+        """Break down the address into tag (using 4 bits for the offset since block size is 16 words)."""
+        block_offset_bits = 4  # log2(16)
+        tag = address >> block_offset_bits
+        return tag
+
+    def search_cache(self, tag, access_index):
+        """Search for the tag in cache. Update LRU counter if needed."""
+        self.searches += 1
+        i = self.tag_index.get(tag)
+        if i is None:
+            return False  # Miss
+        self.hits += 1
+        if self.replacement_policy == 'LRU':
+            self.tag_index.move_to_end(tag)
+            self.lru_stamps[i] = self.lru_counter
+            self.lru_counter += 1
+        elif self.policy is not None:
+            self.policy.hit(i, tag)
+        elif self.replacement_policy == 'OPT':
+            self._update_next_use(i)
+        return True  # Hit
+
+    def _fill_line(self, i, tag):
+        """Load a clean line for tag into slot i."""
+        self.tags[i] = tag
+        self.valid[i] = 1
+        self.dirty[i] = 0
+        self.tag_index[tag] = i
+        if self.replacement_policy == 'LRU':
+            self.lru_stamps[i] = self.lru_counter
+            self.lru_counter += 1
+        else:
+            self.lru_stamps[i] = 0
+            if self.policy is not None:
+                self.policy.fill(i, tag)
+            elif self.replacement_policy == 'OPT':
+                self._update_next_use(i)
+
+    def add_to_cache(self, tag):
+        """Insert the tag into the cache; if full, replace an existing line."""
+        # Lines are never invalidated, so the first empty line is the next unused one.
+        if self.cache_lines_used < self.cache_size_lines:
+            self._fill_line(self.cache_lines_used, tag)
+            self.cache_lines_used += 1
+            return
+
+        # Otherwise, apply the chosen replacement policy.
+        if self.policy is not None:
+            self._replace_with_policy(tag)
+        elif self.replacement_policy == 'FIFO':
+            self._replace_fifo(tag)
+        elif self.replacement_policy == 'LRU':
+            self._replace_lru(tag)
+        elif self.replacement_policy == 'Random':
+            self._replace_random(tag)
+        elif self.replacement_policy == 'OPT':
+            self._replace_opt(tag)
+
+    def _replace_fifo(self, tag):
+        """FIFO replacement: lines were filled in slot order, so the oldest sits under the ring pointer."""
+        fifo_index = self.fifo_pointer
+        self.fifo_pointer = (fifo_index + 1) % self.cache_size_lines
+        if self.dirty[fifo_index]:
+            pass  # Write-back simulation if needed.
+        del self.tag_index[self.tags[fifo_index]]
+        self._fill_line(fifo_index, tag)
+
+    def _replace_lru(self, tag):
+        """LRU replacement: replace the least recently used line, the first entry of the tag index."""
+        _, lru_index = self.tag_index.popitem(last=False)
+        if self.dirty[lru_index]:
+            pass  # Write-back simulation if needed.
+        self._fill_line(lru_index, tag)
+
+    def _replace_with_policy(self, tag):
+        """Pluggable replacement: the policy object chooses the line to replace."""
+        replace_index = self.policy.victim(tag)
+        if self.dirty[replace_index]:
+            pass  # Write-back simulation if needed.
+        del self.tag_index[self.tags[replace_index]]
+        self._fill_line(replace_index, tag)
+
+    def _replace_random(self, tag):
+        """Random replacement: randomly choose a cache line to replace."""
+        replace_index = random.randint(0, self.cache_size_lines - 1)
+        if self.dirty[replace_index]:
+            pass  # Write-back simulation if needed.
+        del self.tag_index[self.tags[replace_index]]
+        self._fill_line(replace_index, tag)
+
+    def plan_opt(self, access_sequence):
+        """
+        Prepare OPT replacement for access_sequence, the trace about to be run (positions
+        count from the next access). One backward pass records where each access's block
+        is next used; blocks never used again get len(access_sequence). Other policies
+        ignore the call.
+        """
+        if self.replacement_policy != 'OPT':
+            return
+        self._plan_opt_tags([self.address_breakdown(address) for address in access_sequence])
+
+    def _plan_opt_tags(self, tags):
+        never = len(tags)
+        next_use = array('q', [never]) * never
+        upcoming = {}
+        for i in range(never - 1, -1, -1):
+            tag = tags[i]
+            next_use[i] = upcoming.get(tag, never)
+            upcoming[tag] = i
+        self.next_use = next_use
+        self.opt_base = self.searches
+        # Lines already resident are next used at their block's first access in the new trace.
+        for i in range(self.cache_lines_used):
+            self.line_next_use[i] = upcoming.get(self.tags[i], never)
+        self._rebuild_opt_heap()
+
+    def _rebuild_opt_heap(self):
+        self.opt_heap = [(-self.line_next_use[i], i) for i in range(self.cache_size_lines) if self.valid[i]]
+        heapq.heapify(self.opt_heap)
+
+    def _update_next_use(self, i):
+        """Key slot i by the next use of the access being handled now."""
+        position = self.searches - 1 - self.opt_base
+        if self.next_use is None or position >= len(self.next_use):
+            raise ValueError("OPT replacement needs the whole trace: call plan_opt() with it first")
+        next_use = self.next_use[position]
+        self.line_next_use[i] = next_use
+        heapq.heappush(self.opt_heap, (-next_use, i))
+        if len(self.opt_heap) > 4 * self.cache_size_lines:
+            self._rebuild_opt_heap()  # Drop stale entries so the heap stays O(cache lines).
+
+    def _replace_opt(self, tag):
+        """OPT replacement: evict the line whose next use is furthest in the future."""
+        while True:
+            key, opt_index = heapq.heappop(self.opt_heap)
+            if self.line_next_use[opt_index] == -key:
+                break  # Entries left behind by later uses of a slot are skipped.
+        if self.dirty[opt_index]:
+            pass  # Write-back simulation if needed.
+        del self.tag_index[self.tags[opt_index]]
+        self._fill_line(opt_index, tag)
+
+    def access_memory(self, address, access_index, operation_type='read'):
+        """Simulate a memory access: check cache and update accordingly."""
+        return self.access_block(self.address_breakdown(address), access_index, operation_type)
+
+    def access_block(self, tag, access_index, operation_type='read'):
+        """access_memory() for an address already broken down into its tag."""
+        if self.search_cache(tag, access_index):
+            if operation_type == 'write':
+                self.dirty[self.tag_index[tag]] = 1
+            return "Hit"
+        else:
+            self.misses += 1
+            self.add_to_cache(tag)
+            return "Miss"
+
+    def access_run(self, tag, access_index, count, operation_type='read'):
+        """
+        count consecutive accesses of one kind to block tag (see cachesim.runlength).
+        Only the first is looked up; the rest are hits by construction, so they are
+        added to the counters and the policy state is brought up to date once.
+        Returns the first access's result.
+        """
+        result = self.access_block(tag, access_index, operation_type)
+        repeats = count - 1
+        if repeats > 0:
+            self.searches += repeats
+            self.hits += repeats
+            i = self.tag_index[tag]
+            if operation_type == 'write':
+                self.dirty[i] = 1
+            if self.replacement_policy == 'LRU':
+                # Already most recent in the tag index; only the stamp moves on.
+                self.lru_stamps[i] = self.lru_counter + repeats - 1
+                self.lru_counter += repeats
+            elif self.policy is not None:
+                self.policy.hit_run(i, tag, repeats)
+            elif self.replacement_policy == 'OPT':
+                self._update_next_use(i)  # Keyed by the run's last access.
+        return result
+
+    def simulate_accesses(self, access_sequence, operation_sequence=None):
+        """Run a series of accesses and record results."""
+        results = []
+        if operation_sequence is None:
+            operation_sequence = ['read'] * len(access_sequence)
+        if self.replacement_policy == 'OPT' and self.next_use is None:
+            self.plan_opt(access_sequence)
+        for i in range(len(access_sequence)):
+            address = access_sequence[i]
+            operation = operation_sequence[i]
+            result = self.access_memory(address, i, operation)
+            results.append((address, operation, result))
+        return results
+
+    def stream_accesses(self, accesses, hit_bitmap=None):
+        """
+        Counters-only run over any iterable (or generator) of addresses or (address, operation)
+        pairs. Nothing is kept per access, so memory stays constant however long the trace is.
+        Operations may be 'read'/'write' or the READ/WRITE codes from cachesim.access_patterns.
+        If hit_bitmap (a bytearray) is given, one bit per access is appended to it, least
+        significant bit first, set on a hit; np.unpackbits(..., bitorder='little') unpacks it.
+        Returns get_performance_metrics(). Under OPT with no plan_opt() made yet, the
+        accesses are first collected into a list so the future can be planned.
+        """
+        if self.replacement_policy == 'OPT' and self.next_use is None:
+            accesses = list(accesses)
+            self.plan_opt([item[0] if isinstance(item, tuple) else item for item in accesses])
+        byte = 0
+        bit = 0
+        for i, item in enumerate(accesses):
+            if isinstance(item, tuple):
+                address, operation = item
+                operation = 'write' if operation == 'write' or operation == WRITE else 'read'
+            else:
+                address, operation = item, 'read'
+            result = self.access_memory(address, i, operation)
+            if hit_bitmap is not None:
+                if result == "Hit":
+                    byte |= 1 << bit
+                bit += 1
+                if bit == 8:
+                    hit_bitmap.append(byte)
+                    byte = 0
+                    bit = 0
+        if hit_bitmap is not None and bit:
+            hit_bitmap.append(byte)
+        return self.get_performance_metrics()
+
+    def stream_runs(self, blocks, counts, operations=None):
+        """
+        Counters-only run over a collapsed trace from cachesim.runlength.block_runs():
+        one lookup per run instead of one per access. Returns get_performance_metrics().
+        """
+        blocks = np.asarray(blocks).tolist()
+        counts = np.asarray(counts).tolist()
+        if operations is None:
+            operations = ['read'] * len(blocks)
+        else:
+            operations = operation_names(operations)
+        if self.replacement_policy == 'OPT' and self.next_use is None:
+            self._plan_opt_tags(np.repeat(blocks, counts).tolist())
+        i = 0
+        for tag, count, operation in zip(blocks, counts, operations):
+            self.access_run(tag, i, count, operation)
+            i += count
+        return self.get_performance_metrics()
+
+    def get_performance_metrics(self):
+        """Return performance metrics including hit and miss ratios."""
+        searches = self.searches
+        misses = self.misses
+        hits = self.hits
+        hit_ratio = (hits / searches) * 100 if searches else 0
+        miss_ratio = (misses / searches) * 100 if searches else 0
+        return {
+            "searches": searches,
+            "misses": misses,
+            "hits": hits,
+            "hit_ratio": hit_ratio,
+            "miss_ratio": miss_ratio
+        }
+
+    def reset_metrics(self):
+        """Reset metrics and cache state for a new simulation run."""
+        self.misses = 0
+        self.searches = 0
+        self.hits = 0
+        self.lru_counter = 0
+        self._allocate_lines()
+        self.tag_index = OrderedDict()
+        self.fifo_pointer = 0
+        self.cache_lines_used = 0
+        self.next_use = None
+        self.opt_heap = []
+        self.opt_base = 0
+        self.policy = self._make_policy()
@@ -0,0 +1,70 @@
+"""
+Multi-policy lockstep simulation.
+
+Comparing replacement policies means running the same trace through caches that differ
+only in their policy. LockstepSimulator keeps one FullyAssociativeCache per policy and
+advances all of them on each access, so the trace is iterated and its tags are decoded
+once (vectorized) for the whole set instead of once per policy. Runs of accesses to the
+same block are collapsed first, so streaming traces take one lookup per block.
+"""
+import numpy as np
+
+from cachesim.access_patterns import READ, WRITE, operation_names
+from cachesim.fully_associative import FullyAssociativeCache
+from cachesim.runlength import block_runs
+
+
+class LockstepSimulator:
+    def __init__(self, cache_size_words, block_size_words, replacement_policies):
+        self.replacement_policies = list(replacement_policies)
+        self.caches = {
+            policy: FullyAssociativeCache(cache_size_words, block_size_words, replacement_policy=policy)
+            for policy in self.replacement_policies
+        }
+        self.accesses_done = 0
+
+    def plan_opt(self, access_sequence):
+        """Hand the whole upcoming trace to any OPT cache (see FullyAssociativeCache.plan_opt)."""
+        if 'OPT' not in self.caches:
+            return
+        self.caches['OPT'].plan_opt(np.asarray(access_sequence, dtype=np.int64).tolist())
+
+    def stream_accesses(self, accesses, operations=None):
+        """
+        Run a sequence of addresses through every cache. operations, if given, holds one
+        'read'/'write' name or READ/WRITE code per access. The trace is collapsed into
+        block runs first (cachesim.runlength), so each run costs one lookup per cache.
+        Returns get_performance_metrics().
+        """
+        addresses = np.asarray(accesses, dtype=np.int64)
+        caches = list(self.caches.values())
+        if 'OPT' in self.caches and self.caches['OPT'].next_use is None:
+            self.plan_opt(addresses)
+        if operations is not None:
+            operations = [WRITE if op == 'write' or op == WRITE else READ for op in np.asarray(operations).tolist()]
+        # Every cache decodes addresses the same way, so the first one decodes for all.
+        tags = caches[0].address_breakdown(addresses)
+        blocks, counts, run_operations = block_runs(tags, 0, operations)
+        blocks = blocks.tolist()
+        counts = counts.tolist()
+        if run_operations is None:
+            run_operations = ['read'] * len(blocks)
+        else:
+            run_operations = operation_names(run_operations)
+        access_runs = [cache.access_run for cache in caches]
+        i = self.accesses_done
+        for tag, count, operation in zip(blocks, counts, run_operations):
+            for access_run in access_runs:
+                access_run(tag, i, count, operation)
+            i += count
+        self.accesses_done = i
+        return self.get_performance_metrics()
+
+    def get_performance_metrics(self):
+        """One FullyAssociativeCache metrics dict per policy."""
+        return {policy: cache.get_performance_metrics() for policy, cache in self.caches.items()}
+
+    def reset_metrics(self):
+        for cache in self.caches.values():
+            cache.reset_metrics()
+        self.accesses_done = 0
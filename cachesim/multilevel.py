@@ -0,0 +1,654 @@
+"""Multi-level cache hierarchy from Tutorial 3: direct-mapped L1, set-associative L2,
+victim cache, write buffer and instruction/data prefetch buffers.
+
+Other hierarchies (more levels, no victim cache, inclusive, ...) are described as a
+dict and built with build_hierarchy(); see TUTORIAL_3_HIERARCHY."""
+import random
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from cachesim.access_patterns import STREAM_INSTRUCTION, STREAM_NONE, WRITE
+
+# ============================================================
+# Helper class: CacheBlock (contains block address, valid, dirty)
+# ============================================================
+class CacheBlock:
+    def __init__(self, block_addr=None, valid=False, dirty=False):
+        self.block_addr = block_addr  # full block base address (16–bit address with lower 4 bits=0)
+        self.valid = valid
+        self.dirty = dirty
+
+# ============================================================
+# Level 1 Cache: Direct Mapped
+#  – 2K words with 16–word blocks → 2048/16 = 128 lines.
+#  – The index is computed as: (block_addr // block_size) mod 128.
+# ============================================================
+class DirectMappedCache:
+    def __init__(self, size_words, block_size):
+        self.block_size = block_size
+        self.num_lines = size_words // block_size  # 2048/16 = 128
+        self.lines = [CacheBlock() for _ in range(self.num_lines)]
+        self.hits = 0
+        self.misses = 0
+        self.accesses = 0
+
+    def index_for_block(self, block_addr):
+        # block_addr is assumed aligned (lowest 4 bits = 0)
+        return (block_addr // self.block_size) % self.num_lines
+
+    def lookup(self, block_addr, operation='read'):
+        self.accesses += 1
+        block = self.lines[(block_addr // self.block_size) % self.num_lines]  # index_for_block(), inlined
+        if block.valid and block.block_addr == block_addr:
+            self.hits += 1
+            if operation == 'write':
+                block.dirty = True
+            return True
+        else:
+            self.misses += 1
+            return False
+
+    def insert(self, block_addr, operation='read'):
+        """
+        Insert a block into L1. If there is an already–present block at the mapped index,
+        return its (block_addr, dirty) status so that the simulator can send it to the victim cache
+        (if clean) or write buffer (if dirty).
+        """
+        idx = self.index_for_block(block_addr)
+        old_block = self.lines[idx]
+        evicted = None
+        if old_block.valid:
+            evicted = (old_block.block_addr, old_block.dirty)
+        self.lines[idx] = CacheBlock(block_addr=block_addr, valid=True, dirty=(operation=='write'))
+        return evicted
+
+    def update_write(self, block_addr):
+        idx = self.index_for_block(block_addr)
+        self.lines[idx].dirty = True
+
+    def invalidate(self, block_addr):
+        """Drop block_addr if present (back-invalidation from an inclusive lower level); returns whether it was dirty."""
+        idx = self.index_for_block(block_addr)
+        if self.lines[idx].valid and self.lines[idx].block_addr == block_addr:
+            dirty = self.lines[idx].dirty
+            self.lines[idx] = CacheBlock()
+            return dirty
+        return False
+
+    def access_batch(self, block_addrs, operations=None):
+        """
+        Run a whole trace of block addresses through this cache on its own, as lookup()
+        followed by insert() on a miss (and update_write() on a write hit) would, but
+        vectorized: an access hits exactly when the previous access to the same line was
+        to the same block. A stable sort by line index groups each line's accesses in
+        trace order, so comparing neighbours gives every hit at once.
+        operations, if given, holds one 'read'/'write' name or READ/WRITE code per access.
+        Returns (hit mask in trace order, counters) and leaves the lines and counters as
+        the per-access calls would.
+        """
+        blocks = np.asarray(block_addrs, dtype=np.int64)
+        n = len(blocks)
+        if n == 0:
+            return np.zeros(0, dtype=bool), {'accesses': 0, 'hits': 0, 'misses': 0}
+        indices = (blocks // self.block_size) % self.num_lines
+        order = np.argsort(indices, kind='stable')
+        sorted_indices = indices[order]
+        sorted_blocks = blocks[order]
+
+        # first[i]: access i (in sorted order) is the first of the batch to its line.
+        first = np.ones(n, dtype=bool)
+        first[1:] = sorted_indices[1:] != sorted_indices[:-1]
+        hit_sorted = np.zeros(n, dtype=bool)
+        hit_sorted[1:] = ~first[1:] & (sorted_blocks[1:] == sorted_blocks[:-1])
+        # The first access to a line hits if the line already holds its block.
+        resident = np.array([line.block_addr if line.valid else -1 for line in self.lines], dtype=np.int64)
+        heads = np.flatnonzero(first)
+        hit_sorted[heads] = resident[sorted_indices[heads]] == sorted_blocks[heads]
+
+        # Final line contents: each line keeps the block of its last segment (a fill, or the
+        # resident block carried in), dirty if any access of that segment was a write.
+        starts = np.flatnonzero(first | ~hit_sorted)
+        if operations is None:
+            segment_dirty = np.zeros(len(starts), dtype=bool)
+        else:
+            writes = np.array([op == 'write' or op == WRITE for op in np.asarray(operations).tolist()], dtype=bool)[order]
+            segment_dirty = np.logical_or.reduceat(writes, starts)
+        last_segment = np.append(first[starts[1:]], True)
+        for start, dirty in zip(starts[last_segment].tolist(), segment_dirty[last_segment].tolist()):
+            idx = int(sorted_indices[start])
+            carried = bool(hit_sorted[start]) and self.lines[idx].dirty
+            self.lines[idx] = CacheBlock(block_addr=int(sorted_blocks[start]), valid=True, dirty=bool(dirty or carried))
+
+        hit_mask = np.empty(n, dtype=bool)
+        hit_mask[order] = hit_sorted
+        hits = int(hit_mask.sum())
+        self.accesses += n
+        self.hits += hits
+        self.misses += n - hits
+        return hit_mask, {'accesses': n, 'hits': hits, 'misses': n - hits}
+
+# ============================================================
+# Level 2 Cache: 4–Way Set–Associative Cache
+#  – 16K words with 16–word blocks → 16384/16 = 1024 blocks.
+#  – With 4 ways, the number of sets = 1024/4 = 256.
+#  – We use an LRU replacement mechanism.
+# ============================================================
+class SetAssociativeCache:
+    def __init__(self, size_words, block_size, ways):
+        self.block_size = block_size
+        total_blocks = size_words // block_size
+        self.num_sets = total_blocks // ways  # 1024/4 = 256
+        self.ways = ways
+        # Block state lives in preallocated (num_sets, ways) buffers, stored row-major so
+        # way j of set s is slot s * ways + j, and is updated in place. Tags and ages are
+        # flat lists rather than arrays: scanning a row then compares ready-made ints
+        # instead of boxing every element. Invalid ways hold tag -1, so a way search is
+        # one membership test on the set's row of tags and never matches them.
+        self.tags = [-1] * total_blocks
+        self.valid = bytearray(total_blocks)
+        self.dirty = bytearray(total_blocks)
+        # For LRU, each block holds the global counter value of its last use.
+        self.lru_ages = [0] * total_blocks
+        self.global_counter = 0
+        self.hits = 0
+        self.misses = 0
+        self.accesses = 0
+
+    @property
+    def sets(self):
+        """CacheBlock snapshots per set and way, built on demand for inspection."""
+        return [[CacheBlock(block_addr=self.tags[slot] if self.valid[slot] else None,
+                            valid=bool(self.valid[slot]), dirty=bool(self.dirty[slot]))
+                 for slot in range(s * self.ways, (s + 1) * self.ways)]
+                for s in range(self.num_sets)]
+
+    def index_for_block(self, block_addr):
+        return (block_addr // self.block_size) % self.num_sets
+
+    def lookup(self, block_addr, operation='read'):
+        self.accesses += 1
+        base = (block_addr // self.block_size) % self.num_sets * self.ways  # index_for_block(), inlined
+        row = self.tags[base:base + self.ways]
+        if block_addr not in row:
+            self.misses += 1
+            return False
+        slot = base + row.index(block_addr)
+        self.hits += 1
+        # Update LRU age.
+        self.lru_ages[slot] = self.global_counter
+        self.global_counter += 1
+        if operation == 'write':
+            self.dirty[slot] = 1
+        return True
+
+    def insert(self, block_addr, operation='read'):
+        base = self.index_for_block(block_addr) * self.ways
+        end = base + self.ways
+        # Look for an invalid (empty) way in the set.
+        slot = self.valid.find(0, base, end)
+        evicted = None
+        if slot < 0:
+            # Otherwise, use LRU replacement: the first way with the oldest age.
+            ages = self.lru_ages[base:end]
+            slot = base + ages.index(min(ages))
+            evicted = (self.tags[slot], bool(self.dirty[slot]))
+        self.tags[slot] = block_addr
+        self.valid[slot] = 1
+        self.dirty[slot] = operation == 'write'
+        self.lru_ages[slot] = self.global_counter
+        self.global_counter += 1
+        return evicted
+
+    def invalidate(self, block_addr):
+        """Drop block_addr if present (back-invalidation from an inclusive lower level); returns whether it was dirty."""
+        base = self.index_for_block(block_addr) * self.ways
+        row = self.tags[base:base + self.ways]
+        if block_addr in row:
+            slot = base + row.index(block_addr)
+            dirty = bool(self.dirty[slot])
+            self.tags[slot] = -1
+            self.valid[slot] = 0
+            self.dirty[slot] = 0
+            return dirty
+        return False
+
+# ============================================================
+# Victim Cache: Fully–Associative, 4 Blocks by default.
+# When L1 evicts a clean block, it is inserted here.
+# Entries are kept in an OrderedDict, oldest first, so lookup, removal and FIFO
+# eviction are all O(1) whatever the capacity.
+# ============================================================
+class VictimCache:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.blocks = OrderedDict()  # block_addr -> dirty, oldest first
+        # The same block can be held twice (a prefetch hit refills L1 while a copy still
+        # sits here). Further copies are keyed (block_addr, serial), and self.copies maps
+        # such a block to the keys of all its copies, oldest first.
+        self.copies = {}
+        self.next_serial = 0
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, block_addr):
+        if self.copies and block_addr in self.copies:
+            self.hits += 1
+            # Remove the oldest copy of the block from victim cache upon hit.
+            keys = self.copies[block_addr]
+            dirty = self.blocks.pop(keys.popleft())
+            if not keys:
+                del self.copies[block_addr]
+            return (block_addr, dirty), True
+        if block_addr in self.blocks:
+            self.hits += 1
+            # Remove block from victim cache upon hit.
+            return (block_addr, self.blocks.pop(block_addr)), True
+        self.misses += 1
+        return None, False
+
+    def insert(self, block_addr, dirty):
+        if self.capacity <= 0:
+            return
+        # Use FIFO replacement.
+        if len(self.blocks) >= self.capacity:
+            key, _ = self.blocks.popitem(last=False)
+            if self.copies:
+                evicted_addr = key[0] if isinstance(key, tuple) else key
+                keys = self.copies.get(evicted_addr)
+                if keys is not None:
+                    keys.popleft()
+                    if not keys:
+                        del self.copies[evicted_addr]
+        if block_addr in self.blocks or (self.copies and block_addr in self.copies):
+            keys = self.copies.get(block_addr)
+            if keys is None:
+                keys = self.copies[block_addr] = deque([block_addr])
+            key = (block_addr, self.next_serial)
+            self.next_serial += 1
+            keys.append(key)
+            self.blocks[key] = dirty
+        else:
+            self.blocks[block_addr] = dirty
+
+# ============================================================
+# Write Buffer: 4 Blocks.
+# When L1 evicts a dirty block, it is stored here until written back.
+# If the buffer is full, we flush (simulate write–back).
+# ============================================================
+class WriteBuffer:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.blocks = []  # list of block addresses
+        self.flushes = 0
+
+    def insert(self, block_addr):
+        self.blocks.append(block_addr)
+        if len(self.blocks) > self.capacity:
+            self.flush()
+
+    def flush(self):
+        # Simulate a flush: all blocks are written back to main memory.
+        self.blocks = []
+        self.flushes += 1
+
+# ============================================================
+# Prefetch Cache: For Instruction and Data Streams.
+# Fully associative with FIFO replacement (4 blocks by default).
+# On a prefetch hit, the block is removed from the prefetch cache.
+# Block addresses are the keys of an OrderedDict, oldest first (O(1) operations).
+# ============================================================
+class PrefetchCache:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.blocks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, block_addr):
+        if block_addr in self.blocks:
+            self.hits += 1
+            del self.blocks[block_addr]
+            return True
+        else:
+            self.misses += 1
+            return False
+
+    def insert(self, block_addr):
+        if self.capacity <= 0 or block_addr in self.blocks:
+            return
+        if len(self.blocks) >= self.capacity:
+            self.blocks.popitem(last=False)
+        self.blocks[block_addr] = None
+
+def direct_mapped_sweep(addresses, cache_sizes_words, block_size=16):
+    """
+    Hit/miss metrics of a standalone direct-mapped cache for each size in
+    cache_sizes_words, using DirectMappedCache.access_batch() (addresses are word
+    addresses, aligned to block_size here).
+    """
+    blocks = np.asarray(addresses, dtype=np.int64) // block_size * block_size
+    results = []
+    for size_words in cache_sizes_words:
+        _, counts = DirectMappedCache(size_words, block_size).access_batch(blocks)
+        accesses = counts['accesses']
+        counts['hit_ratio'] = (counts['hits'] / accesses) * 100 if accesses > 0 else 0
+        counts['miss_ratio'] = (counts['misses'] / accesses) * 100 if accesses > 0 else 0
+        results.append(counts)
+    return results
+
+# ============================================================
+# Hierarchy description
+#  A hierarchy is described by a plain dict:
+#    block_size    words per block (a power of two), shared by every level
+#    levels        list of {'name', 'size_words', 'ways'}, L1 first; ways=1 gives a
+#                  direct-mapped level, otherwise set-associative with LRU
+#    victim        victim cache blocks behind the first level, or None
+#    write_buffer  write buffer blocks for dirty first-level evictions, or None
+#    prefetch      blocks in each of the instruction/data prefetch caches, or None
+#    inclusion     'non-inclusive' (lower-level evictions leave upper copies alone)
+#                  or 'inclusive' (they invalidate the block in every upper level,
+#                  dirty copies going to the write buffer); an inclusive hierarchy
+#                  cannot have a victim cache or prefetch caches, whose hits fill
+#                  only the first level
+#  A block is filled into every level above the one it was found in; clean
+#  first-level evictions go to the victim cache and dirty ones to the write buffer.
+#  Capacities are numbers of blocks; 0 gives a component that never holds anything.
+# ============================================================
+TUTORIAL_3_HIERARCHY = {
+    'block_size': 16,
+    'levels': [
+        {'name': 'L1', 'size_words': 2048, 'ways': 1},   # direct mapped, 128 lines
+        {'name': 'L2', 'size_words': 16384, 'ways': 4},  # 4-way, 256 sets
+    ],
+    'victim': 4,
+    'write_buffer': 4,
+    'prefetch': 4,
+    'inclusion': 'non-inclusive',
+}
+INCLUSION_POLICIES = ('non-inclusive', 'inclusive')
+# Each level becomes a simulator attribute named after it, next to its <name>_hits
+# counter, so neither may collide with the simulator's other attributes.
+RESERVED_NAMES = {'victim', 'write_buffer', 'prefetch_instr', 'prefetch_data', 'description', 'levels',
+                  'seed', 'rng', 'access', 'geometry', 'get_performance', 'reset', 'total_accesses',
+                  'main_memory_accesses', 'victim_hits', 'prefetch_hits'}
+
+
+def check_hierarchy(description):
+    """Validate a hierarchy description; returns a copy with every key filled in."""
+    description = {'victim': None, 'write_buffer': None, 'prefetch': None,
+                   'inclusion': 'non-inclusive', **description}
+    block_size = description['block_size']
+    if block_size <= 0 or block_size & (block_size - 1):
+        raise ValueError(f"block size must be a power of two, not {block_size}")
+    levels = [dict(level, ways=level.get('ways', 1)) for level in description['levels']]
+    if not levels:
+        raise ValueError("a hierarchy needs at least one cache level")
+    attributes = set(RESERVED_NAMES)
+    for level in levels:
+        name = level['name']
+        if (not name.isidentifier() or name.startswith('_')
+                or name in attributes or name + '_hits' in attributes):
+            raise ValueError(f"bad or repeated level name {name!r}")
+        attributes.update((name, name + '_hits'))
+        lines = level['size_words'] // block_size
+        if lines <= 0 or level['size_words'] % block_size or lines % level['ways']:
+            raise ValueError(f"{name}: {level['size_words']} words do not split into "
+                             f"{level['ways']}-way sets of {block_size}-word blocks")
+    for key in ('victim', 'write_buffer', 'prefetch'):
+        capacity = description[key]
+        if capacity is not None and (not isinstance(capacity, int) or capacity < 0):
+            raise ValueError(f"{key} capacity must be a number of blocks (0 or more) or None, not {capacity!r}")
+    if description['inclusion'] not in INCLUSION_POLICIES:
+        raise ValueError(f"inclusion must be one of {', '.join(INCLUSION_POLICIES)}")
+    if description['inclusion'] == 'inclusive' and (description['victim'] is not None
+                                                    or description['prefetch'] is not None):
+        raise ValueError("an inclusive hierarchy cannot have a victim cache or prefetch caches")
+    description['levels'] = levels
+    return description
+
+
+def _make_level(level, block_size):
+    if level['ways'] == 1:
+        return DirectMappedCache(size_words=level['size_words'], block_size=block_size)
+    return SetAssociativeCache(size_words=level['size_words'], block_size=block_size, ways=level['ways'])
+
+
+class CacheHierarchySimulator:
+    """
+    Simulator built from a hierarchy description. Each cache level is an attribute named
+    after it (e.g. sim.L1), next to victim, write_buffer, prefetch_instr and prefetch_data
+    (None when not configured). access(address, operation='read', stream=STREAM_NONE)
+    is put together from one closure per component when the simulator is built, so it
+    goes through the configured components only; stream (STREAM_INSTRUCTION or
+    STREAM_DATA, e.g. from a tagged trace) says which prefetch cache a read uses.
+    The statistics (total_accesses, <name>_hits, ...) are read off the components' own
+    counters, so access() does no counting of its own.
+    """
+    def __init__(self, description, seed=None):
+        self.description = check_hierarchy(description)
+        block_size = self.description['block_size']
+        self.levels = [_make_level(level, block_size) for level in self.description['levels']]
+        for level, cache in zip(self.description['levels'], self.levels):
+            setattr(self, level['name'], cache)
+        victim, write_buffer, prefetch = (self.description[key] for key in ('victim', 'write_buffer', 'prefetch'))
+        self.victim = VictimCache(capacity=victim) if victim is not None else None
+        self.write_buffer = WriteBuffer(capacity=write_buffer) if write_buffer is not None else None
+        self.prefetch_instr = PrefetchCache(capacity=prefetch) if prefetch is not None else None
+        self.prefetch_data = PrefetchCache(capacity=prefetch) if prefetch is not None else None
+        # Reads without a stream tag go to a random prefetch cache: drawn from a Random
+        # of this simulator's own when seeded, otherwise from the global random module.
+        self.seed = seed
+        self.rng = random.Random(seed) if seed is not None else random
+        self.access = self._build_access()
+
+    # Statistics: every access either hits a prefetch cache or looks up the first level,
+    # and goes to main memory exactly when it misses the last one.
+    @property
+    def prefetch_hits(self):
+        return self.prefetch_instr.hits + self.prefetch_data.hits if self.prefetch_instr is not None else 0
+
+    @property
+    def victim_hits(self):
+        return self.victim.hits if self.victim is not None else 0
+
+    @property
+    def total_accesses(self):
+        return self.levels[0].accesses + self.prefetch_hits
+
+    @property
+    def main_memory_accesses(self):
+        return self.levels[-1].misses
+
+    def __getattr__(self, name):
+        # <name>_hits for each level, e.g. sim.L1_hits (only called for unknown attributes).
+        if name.endswith('_hits'):
+            cache = self.__dict__.get(name[:-len('_hits')])
+            if cache is not None and any(cache is level for level in self.__dict__.get('levels', ())):
+                return cache.hits
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _insert_function(self, j):
+        """insert(block_addr, operation) for level j, handling the block it evicts."""
+        insert = self.levels[j].insert
+        victim, write_buffer = self.victim, self.write_buffer
+        if j == 0:
+            if victim is None and write_buffer is None:
+                return insert
+
+            def insert_first(block_addr, operation):
+                evicted = insert(block_addr, operation)
+                if evicted is not None:
+                    if evicted[1]:
+                        if write_buffer is not None:
+                            write_buffer.insert(evicted[0])
+                    elif victim is not None:
+                        victim.insert(evicted[0], False)
+            return insert_first
+        if self.description['inclusion'] != 'inclusive':
+            return insert
+        upper_levels = self.levels[:j]
+
+        def insert_inclusive(block_addr, operation):
+            evicted = insert(block_addr, operation)
+            if evicted is not None:
+                # Back-invalidate the block above; a dirty copy is written back once.
+                dirty = False
+                for upper in upper_levels:
+                    dirty |= upper.invalidate(evicted[0])
+                if dirty and write_buffer is not None:
+                    write_buffer.insert(evicted[0])
+        return insert_inclusive
+
+    def _fill_function(self, depth):
+        """fill(block_addr, operation, prefetch) for a block found below the first `depth` levels."""
+        inserts = [self._insert_function(j) for j in range(depth - 1, -1, -1)]  # Lowest level first.
+        block_size = self.description['block_size']
+
+        if len(inserts) == 1:  # The common case (a block found in L2 or the victim cache), without the loop.
+            insert = inserts[0]
+
+            def fill(block_addr, operation, prefetch):
+                insert(block_addr, operation)
+                if prefetch is not None:
+                    prefetch.insert(block_addr + block_size)
+        else:
+            def fill(block_addr, operation, prefetch):
+                for insert in inserts:
+                    insert(block_addr, operation)
+                if prefetch is not None:
+                    prefetch.insert(block_addr + block_size)
+        return fill
+
+    def _level_probe(self, k, below):
+        """probe(block_addr, operation, prefetch) that checks level k and goes on to below on a miss."""
+        lookup = self.levels[k].lookup
+        result = f"Hit in {self.description['levels'][k]['name']}"
+        fill = self._fill_function(k)
+
+        def probe(block_addr, operation, prefetch):
+            if lookup(block_addr, operation):
+                fill(block_addr, operation, prefetch)
+                return result
+            return below(block_addr, operation, prefetch)
+        return probe
+
+    def _build_access(self):
+        fill_first = self._fill_function(1)
+        fill_all = self._fill_function(len(self.levels))
+
+        def memory(block_addr, operation, prefetch):
+            fill_all(block_addr, operation, prefetch)
+            return 'Miss – Fetched from Main Memory'
+
+        # Everything below the first level, which access() checks itself: a hit there
+        # needs no fill, only the prefetch, and it is the path most accesses take.
+        below = memory
+        for k in range(len(self.levels) - 1, 0, -1):
+            below = self._level_probe(k, below)
+        if self.victim is not None:
+            victim_lookup, below_victim = self.victim.lookup, below
+
+            def below(block_addr, operation, prefetch):
+                if victim_lookup(block_addr)[1]:
+                    fill_first(block_addr, operation, prefetch)
+                    return 'Hit in Victim Cache'
+                return below_victim(block_addr, operation, prefetch)
+
+        first_lookup = self.levels[0].lookup
+        first_hit = f"Hit in {self.description['levels'][0]['name']}"
+        block_size = self.description['block_size']
+        block_mask = -block_size  # Aligns an address to a block boundary.
+        if self.prefetch_instr is None:
+            def access(address, operation='read', stream=STREAM_NONE):
+                block_addr = address & block_mask
+                if first_lookup(block_addr, operation):
+                    return first_hit
+                return below(block_addr, operation, None)
+            return access
+
+        prefetch_instr, prefetch_data, draw = self.prefetch_instr, self.prefetch_data, self.rng.random
+
+        def access(address, operation='read', stream=STREAM_NONE):
+            block_addr = address & block_mask
+            # Writes belong to the data stream; untagged reads pick a stream at random.
+            if operation == 'read':
+                instruction = stream == STREAM_INSTRUCTION if stream else draw() < 0.5
+                prefetch = prefetch_instr if instruction else prefetch_data
+                if prefetch.lookup(block_addr):
+                    fill_first(block_addr, operation, prefetch)
+                    return 'Hit in Prefetch (Instruction)' if instruction else 'Hit in Prefetch (Data)'
+            else:
+                prefetch = prefetch_data
+            if first_lookup(block_addr, operation):
+                prefetch.insert(block_addr + block_size)
+                return first_hit
+            return below(block_addr, operation, prefetch)
+        return access
+
+    def geometry(self):
+        """Sizes of every component, e.g. for keying stored results."""
+        geometry = {}
+        for level, cache in zip(self.description['levels'], self.levels):
+            if level['ways'] == 1:
+                geometry[level['name']] = {'lines': cache.num_lines, 'block_size': cache.block_size}
+            else:
+                geometry[level['name']] = {'sets': cache.num_sets, 'ways': cache.ways, 'block_size': cache.block_size}
+        for name in ('victim', 'write_buffer', 'prefetch_instr', 'prefetch_data'):
+            component = getattr(self, name)
+            if component is not None:
+                geometry[name] = component.capacity
+        if self.description['inclusion'] != 'non-inclusive':
+            geometry['inclusion'] = self.description['inclusion']
+        return geometry
+
+    def get_performance(self):
+        level_names = [level['name'] for level in self.description['levels']]
+        hits = {name: getattr(self, name + '_hits') for name in level_names}
+        total_hits = sum(hits.values()) + self.victim_hits + self.prefetch_hits
+        hit_ratio = (total_hits / self.total_accesses) * 100 if self.total_accesses > 0 else 0
+        miss_ratio = (self.main_memory_accesses / self.total_accesses) * 100 if self.total_accesses > 0 else 0
+        performance = {'Total Accesses': self.total_accesses}
+        for i, name in enumerate(level_names):
+            performance[f'{name} Hits'] = hits[name]
+            if i == 0 and self.victim is not None:
+                performance['Victim Hits'] = self.victim_hits
+        if self.prefetch_instr is not None:
+            performance['Prefetch Hits'] = self.prefetch_hits
+        performance['Main Memory Accesses'] = self.main_memory_accesses
+        if self.write_buffer is not None:
+            performance['Write Buffer Flushes'] = self.write_buffer.flushes
+        performance['Hit Ratio (%)'] = hit_ratio
+        performance['Miss Ratio (%)'] = miss_ratio
+        return performance
+
+    def reset(self):
+        self.__init__(self.description, self.seed)
+
+
+def build_hierarchy(description, seed=None):
+    """Build a simulator for a hierarchy description (see TUTORIAL_3_HIERARCHY)."""
+    return CacheHierarchySimulator(description, seed)
+
+
+# ============================================================
+# Multi–Level Cache Simulator: the Tutorial 3 hierarchy
+#  L1 direct mapped → victim cache → L2 4-way → main memory, with a write buffer
+#  and instruction/data prefetch caches. The flow of access() is:
+#    1. (For read accesses) Check the appropriate prefetch cache.
+#    2. Check L1.
+#    3. On L1 miss, check the victim cache.
+#    4. On victim miss, check L2.
+#    5. On L2 miss, fetch from main memory.
+#  When inserting into L1, if a block is evicted:
+#    – If dirty, add it to the write buffer.
+#    – If clean, add it to the victim cache.
+#  Also, after each access, prefetch the “next block” (block_addr + 16)
+#  into the appropriate prefetch cache.
+# ============================================================
+class MultiLevelCacheSimulator(CacheHierarchySimulator):
+    def __init__(self, victim_capacity=4, prefetch_capacity=4, seed=None):
+        super().__init__(dict(TUTORIAL_3_HIERARCHY, victim=victim_capacity, prefetch=prefetch_capacity), seed)
+
+    def reset(self):
+        self.__init__(self.description['victim'], self.description['prefetch'], self.seed)
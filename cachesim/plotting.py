@@ -0,0 +1,68 @@
+"""
+Figure rendering, kept apart from the simulations.
+
+A figure is described by a plain dict (a figure spec) built from stored results, so
+rendering is its own stage: nothing here runs a simulation, and matplotlib is only
+imported, in whichever process draws, when a figure is actually rendered.
+render_figures() draws a batch of specs in parallel on a process pool.
+
+Spec keys: path (output PNG), title, xlabel, ylabel, series (see line_series()),
+xscale ('log' or None), xscale_base (e.g. 2) and figsize.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+
+def line_series(x, y, label, marker='o', linestyle=None):
+    return {'x': list(x), 'y': list(y), 'label': label, 'marker': marker, 'linestyle': linestyle}
+
+
+def line_figure(path, title, xlabel, ylabel, series, xscale='log', xscale_base=None, figsize=(8, 6)):
+    return {
+        'path': path,
+        'title': title,
+        'xlabel': xlabel,
+        'ylabel': ylabel,
+        'series': list(series),
+        'xscale': xscale,
+        'xscale_base': xscale_base,
+        'figsize': list(figsize),
+    }
+
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use('Agg')  # Use Agg backend for non-interactive plotting
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def render_figure(spec):
+    """Draw one figure spec to its PNG and return the path."""
+    plt = _pyplot()
+    plt.figure(figsize=spec['figsize'])
+    for series in spec['series']:
+        style = {'linestyle': series['linestyle']} if series['linestyle'] else {}
+        plt.plot(series['x'], series['y'], marker=series['marker'], label=series['label'], **style)
+    if spec['xscale']:
+        if spec['xscale_base']:
+            plt.xscale(spec['xscale'], base=spec['xscale_base'])
+        else:
+            plt.xscale(spec['xscale'])
+    plt.title(spec['title'])
+    plt.xlabel(spec['xlabel'])
+    plt.ylabel(spec['ylabel'])
+    plt.grid(True, which="both", ls="--")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(spec['path'])
+    plt.close()
+    return spec['path']
+
+
+def render_figures(specs, max_workers=None):
+    """Render many figure specs in parallel; returns the paths written."""
+    specs = list(specs)
+    if len(specs) <= 1 or max_workers == 1:
+        return [render_figure(spec) for spec in specs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(render_figure, specs))
@@ -0,0 +1,172 @@
+"""
+Pluggable replacement policies for FullyAssociativeCache.
+
+A policy tracks the cache's slots and picks victims; the cache itself keeps the line
+state and the tag -> slot index. Every policy here does constant (amortized) work per
+access, so large caches can be simulated without the policy dominating the runtime.
+
+The cache calls, with slot the line's index and tag its block number:
+    hit(slot, tag)    on every hit
+    hit_run(slot, tag, count)
+                      for count further hits in a row on the line just accessed; the
+                      default calls hit() once, which is exact for idempotent policies
+    fill(slot, tag)   after loading tag into slot (free slots and replacements alike)
+    victim(tag)       on a miss in a full cache; returns the slot to evict, and may
+                      use the missing tag (ARC consults its ghost lists with it)
+"""
+from collections import OrderedDict
+
+
+class ReplacementPolicy:
+    def __init__(self, num_lines):
+        self.num_lines = num_lines
+
+    def hit(self, slot, tag):
+        pass
+
+    def hit_run(self, slot, tag, count):
+        self.hit(slot, tag)
+
+    def fill(self, slot, tag):
+        pass
+
+    def victim(self, tag):
+        raise NotImplementedError
+
+
+class ClockPolicy(ReplacementPolicy):
+    """CLOCK / second chance: the hand skips (and clears) lines referenced since its last pass."""
+
+    def __init__(self, num_lines):
+        super().__init__(num_lines)
+        self.referenced = bytearray(num_lines)
+        self.hand = 0
+
+    def hit(self, slot, tag):
+        self.referenced[slot] = 1
+
+    def fill(self, slot, tag):
+        # A line earns its second chance by being hit after it is loaded, so a stream
+        # of one-off accesses cycles through without displacing re-used lines.
+        self.referenced[slot] = 0
+
+    def victim(self, tag):
+        referenced = self.referenced
+        hand = self.hand
+        while referenced[hand]:
+            referenced[hand] = 0
+            hand = (hand + 1) % self.num_lines
+        self.hand = (hand + 1) % self.num_lines
+        return hand
+
+
+class LFUPolicy(ReplacementPolicy):
+    """
+    O(1) LFU: slots are grouped into buckets by access count, and the least frequently
+    used line is taken from the lowest non-empty bucket (oldest first among equals).
+    """
+
+    def __init__(self, num_lines):
+        super().__init__(num_lines)
+        self.counts = [0] * num_lines
+        self.buckets = {}  # access count -> OrderedDict of slots, oldest first
+        self.min_count = 0
+
+    def hit(self, slot, tag):
+        self.hit_run(slot, tag, 1)
+
+    def hit_run(self, slot, tag, count):
+        old_count = self.counts[slot]
+        bucket = self.buckets[old_count]
+        del bucket[slot]
+        if not bucket:
+            del self.buckets[old_count]
+            if self.min_count == old_count:
+                self.min_count = old_count + 1  # A lower bound; victim() moves up to a live bucket.
+        self.counts[slot] = old_count + count
+        self.buckets.setdefault(old_count + count, OrderedDict())[slot] = None
+
+    def fill(self, slot, tag):
+        self.counts[slot] = 1
+        self.buckets.setdefault(1, OrderedDict())[slot] = None
+        self.min_count = 1
+
+    def victim(self, tag):
+        while self.min_count not in self.buckets:
+            self.min_count += 1  # Only after hit_run() skipped counts; amortized over those hits.
+        bucket = self.buckets[self.min_count]
+        slot, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self.buckets[self.min_count]
+        return slot  # fill() resets min_count for the incoming line.
+
+
+class ARCPolicy(ReplacementPolicy):
+    """
+    Adaptive Replacement Cache (Megiddo & Modha). Resident lines are split between T1
+    (seen once recently) and T2 (seen at least twice); B1/B2 remember the tags recently
+    evicted from each. A miss that hits a ghost list moves the target size p of T1
+    towards the list that would have kept it, so one-off scans stay confined to T1.
+    """
+
+    def __init__(self, num_lines):
+        super().__init__(num_lines)
+        self.t1 = OrderedDict()  # tag -> slot, least recent first
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()  # ghost tags, least recent first
+        self.b2 = OrderedDict()
+        self.p = 0
+        self.refill_frequent = False  # Whether the line being loaded belongs in T2
+
+    def hit(self, slot, tag):
+        if tag in self.t1:
+            del self.t1[tag]
+        else:
+            del self.t2[tag]
+        self.t2[tag] = slot
+
+    def fill(self, slot, tag):
+        if self.refill_frequent:
+            self.t2[tag] = slot
+        else:
+            self.t1[tag] = slot
+        self.refill_frequent = False
+
+    def _replace(self, in_b2):
+        """Evict from T1 or T2 depending on the target p; the victim's tag becomes a ghost."""
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p)):
+            tag, slot = self.t1.popitem(last=False)
+            self.b1[tag] = None
+        else:
+            tag, slot = self.t2.popitem(last=False)
+            self.b2[tag] = None
+        return slot
+
+    def victim(self, tag):
+        c = self.num_lines
+        if tag in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) / len(self.b1), 1))
+            del self.b1[tag]
+            self.refill_frequent = True
+            return self._replace(False)
+        if tag in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) / len(self.b2), 1))
+            del self.b2[tag]
+            self.refill_frequent = True
+            return self._replace(True)
+        if len(self.t1) + len(self.b1) == c:
+            if len(self.t1) < c:
+                self.b1.popitem(last=False)
+                return self._replace(False)
+            _, slot = self.t1.popitem(last=False)  # B1 is empty: drop T1's LRU without a ghost.
+            return slot
+        if len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= 2 * c:
+            self.b2.popitem(last=False)
+        return self._replace(False)
+
+
+REPLACEMENT_POLICIES = {
+    'CLOCK': ClockPolicy,
+    'LFU': LFUPolicy,
+    'ARC': ARCPolicy,
+}
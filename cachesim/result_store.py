@@ -0,0 +1,70 @@
+"""
+Persistent on-disk store for simulation results.
+
+Every result is one JSON file named by a SHA-256 key over what produced it: the
+simulator, its geometry, the replacement policy, a digest of the trace, the seed and
+any other run parameters (e.g. prefix lengths). Files are written to a temporary name
+and renamed into place, so an interrupted sweep leaves only complete results behind and
+the next run simply skips them. Delete the store directory to force a full rerun, e.g.
+after changing a simulator.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+STORE_FORMAT = 1  # Part of every key; bump to invalidate results stored by older code.
+
+
+def trace_digest(*traces):
+    """SHA-256 of one or more address sequences (e.g. a trace and its warm-up), as int64."""
+    digest = hashlib.sha256()
+    for trace in traces:
+        trace = np.ascontiguousarray(trace if trace is not None else [], dtype=np.int64)
+        digest.update(len(trace).to_bytes(8, 'little'))
+        digest.update(trace.tobytes())
+    return digest.hexdigest()
+
+
+def result_key(simulator, geometry, policy, trace_digest, seed, **params):
+    """Key for one result; params holds any further run parameters that affect it."""
+    config = {
+        'format': STORE_FORMAT,
+        'simulator': simulator,
+        'geometry': geometry,
+        'policy': policy,
+        'trace': trace_digest,
+        'seed': seed,
+        'params': params,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+class ResultStore:
+    """A directory of JSON results, two-level fanned out by key prefix."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key + '.json')
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+    def get(self, key, default=None):
+        try:
+            with open(self.path(key)) as f:
+                return json.load(f)['result']
+        except FileNotFoundError:
+            return default
+
+    def put(self, key, result, **config):
+        """Store result under key; config is saved alongside it for inspection only."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'config': config, 'result': result}, f)
+        os.replace(temp_path, path)
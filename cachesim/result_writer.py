@@ -0,0 +1,140 @@
+"""
+Bulk export of sweep results.
+
+ResultWriter streams flat records (one dict per simulated cell) to a file in buffered
+batches, so a large sweep writes a few big chunks instead of printing every metric.
+The format follows the file extension:
+
+    .csv      comma-separated, header from the first record's keys
+    .jsonl    one JSON object per line
+    .parquet  columnar, one row group per batch (needs the optional pyarrow package)
+
+read_results() loads any of them back as a list of dicts, and format_table() renders
+records as a plain-text table when a human-readable view is wanted.
+"""
+import csv
+import json
+import os
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+DEFAULT_BATCH = 4096  # records per write
+
+
+def _format_for(path, format=None):
+    if format is None:
+        format = FORMATS.get(os.path.splitext(path)[1].lower())
+    if format not in FORMATS.values():
+        raise ValueError(f"{path}: unknown results format; use one of {', '.join(FORMATS)}")
+    return format
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("writing or reading .parquet results needs pyarrow (pip install pyarrow); "
+                          "use .csv or .jsonl otherwise") from None
+    return pyarrow
+
+
+class ResultWriter:
+    def __init__(self, path, format=None, fields=None, batch_size=DEFAULT_BATCH):
+        self.path = path
+        self.format = _format_for(path, format)
+        self.fields = list(fields) if fields else None
+        self.batch_size = batch_size
+        self.batch = []
+        self.count = 0
+        self.file = None
+        self.parquet_writer = None
+        if self.format == 'parquet':
+            _pyarrow()  # Fail now rather than at the first flush.
+        else:
+            self.file = open(path, 'w', newline='' if self.format == 'csv' else None)
+            self.csv_writer = None
+
+    def write(self, record):
+        self.batch.append(record)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if not self.batch:
+            return
+        if self.fields is None:
+            self.fields = list(self.batch[0])
+        if self.format == 'csv':
+            if self.csv_writer is None:
+                self.csv_writer = csv.DictWriter(self.file, fieldnames=self.fields)
+                self.csv_writer.writeheader()
+            self.csv_writer.writerows(self.batch)
+        elif self.format == 'jsonl':
+            self.file.write(''.join(json.dumps(record) + '\n' for record in self.batch))
+        else:
+            pyarrow = _pyarrow()
+            table = pyarrow.Table.from_pylist(self.batch)
+            if self.parquet_writer is None:
+                self.parquet_writer = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+            self.parquet_writer.write_table(table)
+        self.count += len(self.batch)
+        self.batch = []
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_results(path, records, format=None, fields=None):
+    """Write a whole sequence of records in one call; returns how many were written."""
+    with ResultWriter(path, format, fields) as writer:
+        writer.write_many(records)
+    return writer.count
+
+
+def _csv_value(text):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def read_results(path, format=None):
+    """Load records written by ResultWriter (CSV numbers come back as int/float)."""
+    format = _format_for(path, format)
+    if format == 'csv':
+        with open(path, newline='') as f:
+            return [{key: _csv_value(value) for key, value in row.items()} for row in csv.DictReader(f)]
+    if format == 'jsonl':
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    return _pyarrow().parquet.read_table(path).to_pylist()
+
+
+def format_table(records, columns=None, float_format='{:.2f}'):
+    """Plain-text table of records, one row each, columns padded to their widest cell."""
+    records = list(records)
+    if columns is None:
+        columns = list(records[0]) if records else []
+    cells = [[float_format.format(v) if isinstance(v, float) else str(v) for v in
+              (record.get(column, '') for column in columns)] for record in records]
+    widths = [max([len(column)] + [len(row[i]) for row in cells]) for i, column in enumerate(columns)]
+    lines = ['  '.join(column.rjust(width) for column, width in zip(columns, widths)),
+             '  '.join('-' * width for width in widths)]
+    lines.extend('  '.join(cell.rjust(width) for cell, width in zip(row, widths)) for row in cells)
+    return '\n'.join(lines)
@@ -0,0 +1,31 @@
+"""
+Run-length collapse of block-address traces.
+
+Consecutive accesses to the same block are all hits after the first, whatever the
+replacement policy, so a simulator only has to look the block up once per run and
+account for the rest in bulk. A streaming trace with 16-word blocks and word-granular
+addresses shrinks 16x this way.
+"""
+import numpy as np
+
+
+def block_runs(addresses, block_offset_bits=4, operations=None):
+    """
+    Collapse a trace into runs of consecutive accesses to the same block.
+
+    Returns (blocks, counts, operations): the block number of each run, how many
+    accesses it covers, and its operation code (READ/WRITE), or None when no
+    operations are given. With operations, a run also ends where the operation
+    changes, so every access in a run is the same kind.
+    """
+    blocks = np.asarray(addresses, dtype=np.int64) >> block_offset_bits
+    if len(blocks) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, None if operations is None else np.empty(0, dtype=np.uint8)
+    starts = blocks[1:] != blocks[:-1]
+    if operations is not None:
+        operations = np.asarray(operations, dtype=np.uint8)
+        starts |= operations[1:] != operations[:-1]
+    starts = np.concatenate(([0], np.flatnonzero(starts) + 1))
+    counts = np.diff(np.append(starts, len(blocks)))
+    return blocks[starts], counts, None if operations is None else operations[starts]
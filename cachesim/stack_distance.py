@@ -0,0 +1,117 @@
+"""
+Mattson stack-distance simulation for fully associative LRU caches.
+
+LRU has the inclusion property: a block that hits in an LRU cache of C lines also
+hits in every larger one. So a single pass that records how deep each access sits
+in the LRU stack gives the hit/miss counts for every capacity at once.
+"""
+
+
+class FenwickTree:
+    """Binary indexed tree over access positions (prefix sums in O(log N))."""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, position, delta):
+        i = position + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, end):
+        """Sum of the values at positions [0, end)."""
+        total = 0
+        i = end
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+class StackDistanceProfile:
+    """Reuse-distance histogram of one trace, queried per LRU capacity."""
+
+    def __init__(self, histogram, cold_misses, accesses):
+        # histogram[d] = number of accesses found at depth d of the LRU stack (index 0 unused).
+        self.histogram = histogram
+        self.cold_misses = cold_misses
+        self.accesses = accesses
+        self.cumulative_hits = [0] * len(histogram)
+        running = 0
+        for d in range(1, len(histogram)):
+            running += histogram[d]
+            self.cumulative_hits[d] = running
+
+    @property
+    def max_distance(self):
+        """Largest stack depth seen; every capacity at or above it behaves the same."""
+        return len(self.histogram) - 1
+
+    def hits(self, capacity_lines):
+        if capacity_lines <= 0:
+            return 0
+        return self.cumulative_hits[min(capacity_lines, self.max_distance)]
+
+    def metrics(self, capacity_lines):
+        """Same keys as FullyAssociativeCache.get_performance_metrics() for an LRU cache of this size."""
+        searches = self.accesses
+        hits = self.hits(capacity_lines)
+        misses = searches - hits
+        hit_ratio = (hits / searches) * 100 if searches else 0
+        miss_ratio = (misses / searches) * 100 if searches else 0
+        return {
+            "searches": searches,
+            "misses": misses,
+            "hits": hits,
+            "hit_ratio": hit_ratio,
+            "miss_ratio": miss_ratio
+        }
+
+    def hit_ratios(self, capacities=None):
+        """Hit ratio (%) for each capacity, default 1 .. max_distance lines."""
+        if capacities is None:
+            capacities = range(1, self.max_distance + 1)
+        return [self.metrics(c)["hit_ratio"] for c in capacities]
+
+    def miss_ratios(self, capacities=None):
+        if capacities is None:
+            capacities = range(1, self.max_distance + 1)
+        return [self.metrics(c)["miss_ratio"] for c in capacities]
+
+
+def stack_distance_profile(access_sequence, block_size_words=16, warmup_sequence=None):
+    """
+    Replay the accesses once and return their StackDistanceProfile.
+    Addresses are word addresses; they are grouped into blocks of block_size_words.
+    Accesses in warmup_sequence prime the LRU stack but are not counted.
+    """
+    warmup_sequence = warmup_sequence or []
+    total = len(warmup_sequence) + len(access_sequence)
+    tree = FenwickTree(total)
+    last_position = {}  # block -> position of its most recent access
+    histogram = [0]
+    cold_misses = 0
+
+    position = 0
+    for counted, sequence in ((False, warmup_sequence), (True, access_sequence)):
+        for address in sequence:
+            block = address // block_size_words
+            previous = last_position.get(block)
+            if previous is None:
+                if counted:
+                    cold_misses += 1
+            else:
+                # Distinct blocks touched since the previous access, plus the block itself.
+                distance = tree.prefix_sum(position) - tree.prefix_sum(previous + 1) + 1
+                if counted:
+                    if distance >= len(histogram):
+                        histogram.extend([0] * (distance + 1 - len(histogram)))
+                    histogram[distance] += 1
+                tree.add(previous, -1)
+            tree.add(position, 1)
+            last_position[block] = position
+            position += 1
+
+    return StackDistanceProfile(histogram, cold_misses, len(access_sequence))
@@ -0,0 +1,157 @@
+"""
+Process-parallel parameter sweeps.
+
+Each trace of a sweep is an independent simulation, so the traces are farmed out to a
+process pool; within a job every policy runs in lockstep over one pass of the trace.
+Traces are copied once into shared memory and the workers map them by name, so no trace
+is ever pickled to a worker.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cachesim.lockstep import LockstepSimulator
+from cachesim.result_store import result_key, trace_digest
+
+
+class SharedTrace:
+    """An int64 trace held in a named shared-memory block owned by the parent process."""
+
+    def __init__(self, trace):
+        trace = np.ascontiguousarray(trace, dtype=np.int64)
+        self.length = len(trace)
+        # Zero-length blocks are not allowed, so empty traces still get one byte.
+        self.shm = shared_memory.SharedMemory(create=True, size=max(trace.nbytes, 1))
+        np.ndarray(self.length, dtype=np.int64, buffer=self.shm.buf)[:] = trace
+
+    @property
+    def handle(self):
+        """Small picklable reference that attach_trace() turns back into an array."""
+        return (self.shm.name, self.length)
+
+    def release(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Shared-memory blocks this worker has already mapped, by name.
+_attached = {}
+
+
+def attach_trace(handle):
+    """Zero-copy int64 view of a SharedTrace inside a worker process."""
+    name, length = handle
+    shm = _attached.get(name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = shm
+    return np.ndarray(length, dtype=np.int64, buffer=shm.buf)
+
+
+def prefix_snapshots(simulator, accesses, prefix_lengths):
+    """
+    Run one trace once and return the simulator's metrics after each of the ascending
+    prefix_lengths, instead of re-simulating a fresh trace for every length.
+    Works with FullyAssociativeCache, MultiLevelCacheSimulator, or anything with
+    simulate_accesses() / get_performance_metrics().
+    """
+    if hasattr(simulator, 'get_performance_metrics'):
+        snapshot = simulator.get_performance_metrics
+    else:
+        snapshot = simulator.get_performance
+    if hasattr(simulator, 'plan_opt'):
+        simulator.plan_opt(accesses)  # OPT has to see the whole trace, not just the first prefix.
+    snapshots = []
+    done = 0
+    for length in prefix_lengths:
+        if length < done:
+            raise ValueError("prefix lengths must be in ascending order")
+        segment = accesses[done:length]
+        if hasattr(simulator, 'stream_accesses'):
+            simulator.stream_accesses(segment)
+        elif hasattr(simulator, 'access'):
+            for address in segment:
+                simulator.access(address, 'read')
+        else:
+            simulator.simulate_accesses(segment)
+        done = length
+        snapshots.append(snapshot())
+    return snapshots
+
+
+def _simulate_fully_associative(job):
+    handle, cache_size_words, block_size_words, policies, warmup_sequence, prefix_lengths, seed = job
+    random.seed(seed)  # Random replacement draws from the module-level generator.
+    simulator = LockstepSimulator(cache_size_words, block_size_words, policies)
+    if warmup_sequence:
+        simulator.stream_accesses(warmup_sequence)
+        simulator.reset_metrics()
+    trace = attach_trace(handle)
+    if prefix_lengths is not None:
+        snapshots = prefix_snapshots(simulator, trace, prefix_lengths)
+        return {policy: [snapshot[policy] for snapshot in snapshots] for policy in policies}
+    return simulator.stream_accesses(trace)
+
+
+def run_policy_sweep(traces, policies, cache_size_words, block_size_words,
+                     warmups=None, prefix_lengths=None, seed=0, max_workers=None, store=None):
+    """
+    Simulate every trace under every replacement policy on a process pool.
+
+    traces maps a key (e.g. (pattern, num_accesses)) to an address array; warmups
+    optionally maps the same keys to a warm-up sequence. Returns
+    {(key, policy): metrics}, or {(key, policy): [metrics per prefix]} when
+    prefix_lengths is given. Each trace gets its own seed derived from `seed` and its
+    position in the sweep, so results do not depend on how jobs are scheduled.
+
+    With a ResultStore, cells already in the store are not simulated again and each
+    trace's results are stored as soon as its job finishes, so an interrupted sweep
+    resumes where it stopped.
+    """
+    warmups = warmups or {}
+    policies = list(policies)
+    geometry = {'cache_size_words': cache_size_words, 'block_size_words': block_size_words}
+    results = {}
+    pending = {}  # trace key -> (seed, {policy: store key}) for cells still to simulate
+    for n, key in enumerate(traces):
+        cell_seed = seed + n
+        digest = trace_digest(traces[key], warmups.get(key)) if store is not None else None
+        todo = {}
+        for policy in policies:
+            if store is None:
+                todo[policy] = None
+                continue
+            store_key = result_key('FullyAssociativeCache', geometry, policy, digest, cell_seed,
+                                   prefix_lengths=prefix_lengths)
+            stored = store.get(store_key)
+            if stored is None:
+                todo[policy] = store_key
+            else:
+                results[(key, policy)] = stored
+        if todo:
+            pending[key] = (cell_seed, todo)
+
+    shared = {key: SharedTrace(traces[key]) for key in pending}
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            # Submit the longest traces first so they do not straggle at the end.
+            futures = {}
+            for key in sorted(pending, key=lambda key: -shared[key].length):
+                cell_seed, todo = pending[key]
+                job = (shared[key].handle, cache_size_words, block_size_words, list(todo),
+                       warmups.get(key), prefix_lengths, cell_seed)
+                futures[pool.submit(_simulate_fully_associative, job)] = key
+            for future in as_completed(futures):
+                key = futures[future]
+                for policy, metrics in future.result().items():
+                    results[(key, policy)] = metrics
+                    store_key = pending[key][1][policy]
+                    if store_key is not None:
+                        store.put(store_key, metrics, simulator='FullyAssociativeCache', geometry=geometry,
+                                  policy=policy, trace=str(key), seed=pending[key][0])
+    finally:
+        for trace in shared.values():
+            trace.release()
+    return {(key, policy): results[(key, policy)] for key in traces for policy in policies}
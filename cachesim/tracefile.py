@@ -0,0 +1,293 @@
+"""
+Compact binary trace files with memory-mapped replay.
+
+Layout: a 32-byte little-endian header followed by fixed-size records.
+
+    offset  size  field
+    0       8     magic b'CATRACE\\0'
+    8       2     format version (1)
+    10      2     address width in bits (32 or 64)
+    12      2     flags: bit 0 = records carry a tag byte
+    14      2     reserved
+    16      8     number of records
+    24      8     reserved
+
+Each record is the address (unsigned, address-width bits), followed by one tag byte
+when the flag is set. Tag bit 0 is the operation (READ/WRITE from
+cachesim.access_patterns); bits 1-2 are the stream (STREAM_INSTRUCTION or
+STREAM_DATA from the same module, STREAM_NONE when unknown).
+
+TraceReader maps the file with np.memmap and hands out chunks as views of the map,
+so a multi-GB trace is replayed without ever being loaded into RAM.
+"""
+import argparse
+import json
+import struct
+
+import numpy as np
+
+from cachesim.access_patterns import OPERATION_NAMES, STREAM_DATA, STREAM_INSTRUCTION, STREAM_NONE
+
+MAGIC = b'CATRACE\0'
+VERSION = 1
+HEADER = struct.Struct('<8sHHHHQQ')
+HEADER_SIZE = HEADER.size  # 32 bytes
+FLAG_TAGS = 0x1
+
+DEFAULT_CHUNK = 1 << 20  # records per chunk
+
+
+def record_dtype(address_bits, tagged):
+    if address_bits not in (32, 64):
+        raise ValueError(f"address width must be 32 or 64 bits, not {address_bits}")
+    address = '<u4' if address_bits == 32 else '<u8'
+    if not tagged:
+        return np.dtype(address)
+    return np.dtype([('address', address), ('tag', 'u1')])
+
+
+def make_tags(count, operations=None, streams=None):
+    """Pack per-access operation codes and stream ids into tag bytes."""
+    tags = np.zeros(count, dtype=np.uint8)
+    if operations is not None:
+        tags |= np.asarray(operations, dtype=np.uint8) & 1
+    if streams is not None:
+        tags |= (np.asarray(streams, dtype=np.uint8) & 3) << 1
+    return tags
+
+
+class TraceWriter:
+    """Append address chunks (plus optional operation/stream codes) to a trace file."""
+
+    def __init__(self, path, address_bits=32, tagged=True):
+        self.path = path
+        self.address_bits = address_bits
+        self.tagged = tagged
+        self.dtype = record_dtype(address_bits, tagged)
+        self.count = 0
+        self.file = open(path, 'wb')
+        self.file.write(self._header())
+
+    def _header(self):
+        flags = FLAG_TAGS if self.tagged else 0
+        return HEADER.pack(MAGIC, VERSION, self.address_bits, flags, 0, self.count, 0)
+
+    def write(self, addresses, operations=None, streams=None):
+        addresses = np.asarray(addresses)
+        if len(addresses) and (addresses.min() < 0 or int(addresses.max()) >> self.address_bits):
+            raise ValueError(f"addresses do not fit in {self.address_bits} bits")
+        records = np.empty(len(addresses), dtype=self.dtype)
+        if self.tagged:
+            records['address'] = addresses
+            records['tag'] = make_tags(len(addresses), operations, streams)
+        else:
+            if operations is not None or streams is not None:
+                raise ValueError("this trace was opened without tags")
+            records[:] = addresses
+        self.file.write(records.tobytes())
+        self.count += len(records)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self.file.write(self._header())  # Record count is only known now.
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_trace(path, addresses, operations=None, streams=None, address_bits=32):
+    """Write a whole trace in one call; tags are stored only if operations or streams are given."""
+    tagged = operations is not None or streams is not None
+    with TraceWriter(path, address_bits, tagged) as writer:
+        writer.write(addresses, operations, streams)
+
+
+class TraceReader:
+    """Memory-mapped view of a trace file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"{path}: file too short for a trace header")
+        magic, version, address_bits, flags, _, count, _ = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a trace file")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported trace version {version}")
+        self.address_bits = address_bits
+        self.tagged = bool(flags & FLAG_TAGS)
+        self.count = count
+        self.dtype = record_dtype(address_bits, self.tagged)
+        if count:
+            self.records = np.memmap(path, dtype=self.dtype, mode='r', offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=self.dtype)
+
+    def __len__(self):
+        return self.count
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK, start=0, stop=None):
+        """
+        Yield (addresses, tags) for consecutive slices of the trace. Both are views into
+        the memory map (tags is None for untagged traces); nothing is copied.
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        for begin in range(start, stop, chunk_size):
+            chunk = self.records[begin:min(begin + chunk_size, stop)]
+            if self.tagged:
+                yield chunk['address'], chunk['tag']
+            else:
+                yield chunk, None
+
+    def accesses(self, chunk_size=DEFAULT_CHUNK):
+        """Yield (address, 'read'/'write') pairs, converting one chunk at a time."""
+        for addresses, tags in self.chunks(chunk_size):
+            if tags is None:
+                for address in addresses.tolist():
+                    yield address, 'read'
+            else:
+                for address, op in zip(addresses.tolist(), (tags & 1).tolist()):
+                    yield address, OPERATION_NAMES[op]
+
+    def stream_accesses(self, chunk_size=DEFAULT_CHUNK):
+        """Yield (address, 'read'/'write', stream id) triples; the stream is STREAM_NONE if untagged."""
+        for addresses, tags in self.chunks(chunk_size):
+            if tags is None:
+                for address in addresses.tolist():
+                    yield address, 'read', STREAM_NONE
+            else:
+                for address, op, stream in zip(addresses.tolist(), (tags & 1).tolist(), ((tags >> 1) & 3).tolist()):
+                    yield address, OPERATION_NAMES[op], stream
+
+    def close(self):
+        # Dropping the memmap releases the mapping once no chunk views remain.
+        self.records = None
+
+
+def replay(path, simulator, chunk_size=DEFAULT_CHUNK):
+    """
+    Run a trace file through a simulator and return its metrics. Works with
+    FullyAssociativeCache (counters-only stream_accesses) and with anything that
+    has access(address, operation, stream) / get_performance(), e.g.
+    MultiLevelCacheSimulator, which is handed each record's instruction/data stream.
+    """
+    reader = TraceReader(path)
+    try:
+        if hasattr(simulator, 'stream_accesses'):
+            return simulator.stream_accesses(reader.accesses(chunk_size))
+        for address, operation, stream in reader.stream_accesses(chunk_size):
+            simulator.access(address, operation, stream)
+        return simulator.get_performance()
+    finally:
+        reader.close()
+
+
+def _record(args):
+    from cachesim import access_patterns
+
+    rng = access_patterns.make_rng(args.seed)
+    if args.pattern == 'spatial':
+        addresses = access_patterns.spatial_accesses(args.accesses, step=args.step)
+    elif args.pattern == 'temporal':
+        addresses = access_patterns.temporal_accesses(args.accesses, seed=rng)
+    elif args.pattern == 'random':
+        addresses = access_patterns.random_accesses(args.accesses, args.memory_words, seed=rng)
+    elif args.pattern == 'zipf':
+        addresses = access_patterns.zipf_accesses(args.accesses, args.memory_words // 16, seed=rng)
+    elif args.pattern == 'strided':
+        addresses = access_patterns.strided_accesses(args.accesses, args.step, memory_size_words=args.memory_words)
+    else:
+        addresses = access_patterns.pointer_chase_accesses(args.accesses, args.memory_words // 16, seed=rng)
+    operations = access_patterns.operation_sequence(args.accesses, args.write_ratio, seed=rng)
+    streams = access_patterns.stream_sequence(args.accesses, args.instruction_ratio, operations, seed=rng)
+    write_trace(args.trace, addresses, operations, streams, address_bits=args.address_bits)
+    print(f"Wrote {args.accesses} accesses to {args.trace}")
+
+
+def _info(args):
+    reader = TraceReader(args.trace)
+    print(f"Records      : {reader.count}")
+    print(f"Address width: {reader.address_bits} bits")
+    print(f"Tagged       : {reader.tagged}")
+    if reader.tagged and reader.count:
+        writes = instructions = data = 0
+        for _, tags in reader.chunks():
+            writes += int(np.count_nonzero(tags & 1))
+            streams = (tags >> 1) & 3
+            instructions += int(np.count_nonzero(streams == STREAM_INSTRUCTION))
+            data += int(np.count_nonzero(streams == STREAM_DATA))
+        print(f"Writes       : {writes}")
+        print(f"Instruction  : {instructions}")
+        print(f"Data         : {data}")
+
+
+def _replay(args):
+    if args.simulator == 'fully-associative':
+        from cachesim.fully_associative import FullyAssociativeCache
+        simulator = FullyAssociativeCache(args.cache_words, 16, replacement_policy=args.policy)
+    elif args.hierarchy:
+        from cachesim.multilevel import build_hierarchy
+        with open(args.hierarchy) as f:
+            simulator = build_hierarchy(json.load(f), seed=args.seed)
+    else:
+        from cachesim.multilevel import MultiLevelCacheSimulator
+        simulator = MultiLevelCacheSimulator(seed=args.seed)
+    for key, value in replay(args.trace, simulator).items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record, inspect and replay binary cache traces.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="generate a trace and write it to a file")
+    record.add_argument('trace')
+    record.add_argument('--pattern', default='random',
+                        choices=['spatial', 'temporal', 'random', 'zipf', 'strided', 'pointer-chase'])
+    record.add_argument('--accesses', type=int, default=100000)
+    record.add_argument('--memory-words', type=int, default=64 * 1024)
+    record.add_argument('--step', type=int, default=1, help="step for spatial/strided patterns")
+    record.add_argument('--write-ratio', type=float, default=0.0)
+    record.add_argument('--instruction-ratio', type=float, default=0.5,
+                        help="fraction of reads tagged as the instruction stream (the rest are data)")
+    record.add_argument('--address-bits', type=int, default=32, choices=[32, 64])
+    record.add_argument('--seed', type=int, default=0)
+    record.set_defaults(run=_record)
+
+    info = commands.add_parser('info', help="print a trace file's header")
+    info.add_argument('trace')
+    info.set_defaults(run=_info)
+
+    replay_cmd = commands.add_parser('replay', help="run a trace through one of the simulators")
+    replay_cmd.add_argument('trace')
+    replay_cmd.add_argument('--simulator', choices=['fully-associative', 'multilevel'],
+                            help="default: multilevel with --hierarchy, fully-associative otherwise")
+    replay_cmd.add_argument('--policy', default='LRU', choices=['FIFO', 'LRU', 'Random', 'CLOCK', 'LFU', 'ARC', 'OPT'])
+    replay_cmd.add_argument('--cache-words', type=int, default=2 * 1024)
+    replay_cmd.add_argument('--seed', type=int, default=0,
+                            help="multilevel: seeds the instruction/data choice for records without a stream")
+    replay_cmd.add_argument('--hierarchy', help="JSON hierarchy description (see "
+                                                "cachesim.multilevel.TUTORIAL_3_HIERARCHY) to simulate; "
+                                                "implies --simulator multilevel")
+    replay_cmd.set_defaults(run=_replay)
+
+    args = parser.parse_args(argv)
+    if args.command == 'replay':
+        if args.hierarchy and args.simulator == 'fully-associative':
+            replay_cmd.error("--hierarchy describes a multilevel hierarchy; it cannot be used with "
+                             "--simulator fully-associative")
+        if args.simulator is None:
+            args.simulator = 'multilevel' if args.hierarchy else 'fully-associative'
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,20 @@
+import argparse
+import os
+import queue
+import sys
+import threading
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 import random
-from collections import deque
+from collections import deque, OrderedDict
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cachesim.access_patterns import random_accesses
+from cachesim.frames import FrameBudget
+
 class CacheLine:
     def __init__(self, tag=None, valid=False, dirty=False, lru_counter=0):
         self.tag = tag
@@ -23,6 +32,8 @@ class FullyAssociativeCache:
         self.cache_size_lines = cache_size_lines
         self.replacement_policy = replacement_policy
         self.cache = [CacheLine() for _ in range(self.cache_size_lines)]
+        self.tag_index = OrderedDict()
+        self.fifo_pointer = 0
         self.cache_lines_used = 0
         self.misses = 0
         self.searches = 0
@@ -38,25 +49,26 @@ class FullyAssociativeCache:
 
     def search_cache(self, tag, access_index):
         self.searches += 1
-        for i in range(len(self.cache)):
-            line = self.cache[i]
-            if line.valid and line.tag == tag:
-                self.hits += 1
-                if self.replacement_policy == 'LRU':
-                    self.cache[i].lru_counter = self.lru_counter
-                    self.lru_counter += 1
-                return True
-        return False
+        i = self.tag_index.get(tag)
+        if i is None:
+            return False
+        self.hits += 1
+        if self.replacement_policy == 'LRU':
+            self.tag_index.move_to_end(tag)
+            self.cache[i].lru_counter = self.lru_counter
+            self.lru_counter += 1
+        return True
 
     def add_to_cache(self, tag):
-        for i in range(self.cache_size_lines):
-            if not self.cache[i].valid:
-                self.cache[i] = CacheLine(tag=tag, valid=True, dirty=False)
-                if self.replacement_policy == 'LRU':
-                    self.cache[i].lru_counter = self.lru_counter
-                    self.lru_counter += 1
-                self.cache_lines_used += 1
-                return
+        if self.cache_lines_used < self.cache_size_lines:
+            i = self.cache_lines_used
+            self.cache[i] = CacheLine(tag=tag, valid=True, dirty=False)
+            self.tag_index[tag] = i
+            if self.replacement_policy == 'LRU':
+                self.cache[i].lru_counter = self.lru_counter
+                self.lru_counter += 1
+            self.cache_lines_used += 1
+            return
 
         if self.replacement_policy == 'FIFO':
             self._replace_fifo(tag)
@@ -66,27 +78,24 @@ class FullyAssociativeCache:
             self._replace_random(tag)
 
     def _replace_fifo(self, tag):
-        replaced_line = self.cache.pop(0)
+        fifo_index = self.fifo_pointer
+        self.fifo_pointer = (fifo_index + 1) % self.cache_size_lines
+        replaced_line = self.cache[fifo_index]
         if replaced_line.dirty:
             pass
 
-        self.cache.append(CacheLine(tag=tag, valid=True, dirty=False))
-        if self.replacement_policy == 'LRU':
-            self.cache[-1].lru_counter = self.lru_counter
-            self.lru_counter += 1
+        del self.tag_index[replaced_line.tag]
+        self.cache[fifo_index] = CacheLine(tag=tag, valid=True, dirty=False)
+        self.tag_index[tag] = fifo_index
 
     def _replace_lru(self, tag):
-        lru_index = 0
-        min_lru_counter = self.cache[0].lru_counter
-        for i in range(1, self.cache_size_lines):
-            if self.cache[i].lru_counter < min_lru_counter:
-                min_lru_counter = self.cache[i].lru_counter
-                lru_index = i
+        _, lru_index = self.tag_index.popitem(last=False)
 
         if self.cache[lru_index].dirty:
             pass
 
         self.cache[lru_index] = CacheLine(tag=tag, valid=True, dirty=False)
+        self.tag_index[tag] = lru_index
         self.cache[lru_index].lru_counter = self.lru_counter
         self.lru_counter += 1
 
@@ -94,19 +103,15 @@ class FullyAssociativeCache:
         replace_index = random.randint(0, self.cache_size_lines - 1)
         if self.cache[replace_index].dirty:
             pass
+        del self.tag_index[self.cache[replace_index].tag]
         self.cache[replace_index] = CacheLine(tag=tag, valid=True, dirty=False)
-        if self.replacement_policy == 'LRU':
-            self.cache[replace_index].lru_counter = self.lru_counter
-            self.lru_counter += 1
+        self.tag_index[tag] = replace_index
 
     def access_memory(self, address, access_index, operation_type='read'):
         tag = self.address_breakdown(address)
         is_hit = self.search_cache(tag, access_index)
         if operation_type == 'write' and is_hit:
-            for line in self.cache:
-                if line.valid and line.tag == tag:
-                    line.dirty = True
-                    break
+            self.cache[self.tag_index[tag]].dirty = True
         if not is_hit:
             self.misses += 1
             self.add_to_cache(tag)
@@ -143,6 +148,8 @@ class FullyAssociativeCache:
         self.hits = 0
         self.lru_counter = 0
         self.cache = [CacheLine() for _ in range(self.cache_size_lines)]
+        self.tag_index = OrderedDict()
+        self.fifo_pointer = 0
         self.cache_lines_used = 0
 
     def __str__(self):
@@ -163,6 +170,35 @@ class FullyAssociativeCache:
         )
         return metrics_str
 
+
+class VisualSimulation:
+    """A visual simulation run: steps through an access sequence, logging each request.
+
+    Holds no Tk state, so the window and the headless mode drive the same code.
+    """
+    def __init__(self, cache, accesses, log):
+        self.cache = cache
+        self.accesses = accesses
+        self.log = log
+        self.step = 0
+        self.last_miss = None  # Block of the latest miss not yet shown in main memory
+
+    def remaining(self):
+        return len(self.accesses) - self.step
+
+    def advance(self, count):
+        end = min(self.step + count, len(self.accesses))
+        for i in range(self.step, end):
+            block_number = self.accesses[i]
+            self.log(f"Request {i+1}/{len(self.accesses)}: Block {block_number}")
+            if self.cache.access_memory(block_number, i) == "Miss":
+                self.log("Cache miss! Loading from Main Memory...")
+                self.last_miss = block_number
+            else:
+                self.log("Cache hit!")
+        self.step = end
+
+
 class CacheSimulatorGUI(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -172,8 +208,58 @@ class CacheSimulatorGUI(tk.Tk):
         self.cache = FullyAssociativeCache(CAPACITY, replacement_policy="LRU")
         self.current_block_request = None
 
-        self.visual_accesses = []
-        self.current_step = 0
+        self.visual = None
+        self.frame_budget = FrameBudget()
+
+        # Output log: only the newest LOG_MAX_LINES lines are kept and shown.
+        self.log_lines = deque(maxlen=LOG_MAX_LINES)
+        self.log_dirty = False
+        # Background test runs post progress here; the frame loop drains it.
+        self.worker = None
+        self.worker_queue = queue.Queue()
+        # Redraw requests are only recorded; the frame loop applies at most one per frame.
+        self.redraw_pending = False
+        self.redraw_highlight = None
+        self.after(FRAME_INTERVAL, self.frame_tick)
+
+    def log(self, text):
+        self.log_lines.extend(text.rstrip("\n").split("\n"))
+        self.log_dirty = True
+
+    def clear_log(self):
+        self.log_lines.clear()
+        self.log_dirty = True
+
+    def request_redraw(self, highlight_idx=None):
+        self.redraw_pending = True
+        self.redraw_highlight = highlight_idx
+
+    def frame_tick(self):
+        """Runs every FRAME_INTERVAL ms: applies worker messages, then at most one log and grid refresh."""
+        try:
+            while True:
+                self.handle_worker_message(*self.worker_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if self.log_dirty:
+            self.output_area.delete("1.0", tk.END)
+            self.output_area.insert(tk.END, "\n".join(self.log_lines) + "\n")
+            self.output_area.see(tk.END)
+            self.log_dirty = False
+        if self.redraw_pending:
+            self.update_cache_grid(self.redraw_highlight)
+            self.redraw_pending = False
+        self.after(FRAME_INTERVAL, self.frame_tick)
+
+    def set_controls_enabled(self, enabled):
+        state = tk.NORMAL if enabled else tk.DISABLED
+        for button in (self.run_test_button, self.processor_button, self.run_visual_button):
+            button.config(state=state)
+
+    def busy(self):
+        """True while a test worker or a visual simulation is using the cache."""
+        worker_alive = self.worker is not None and self.worker.is_alive()
+        return worker_alive or (self.visual is not None and self.visual.remaining() > 0)
 
     def create_widgets(self):
         top_frame = ttk.Frame(self)
@@ -211,6 +297,9 @@ class CacheSimulatorGUI(tk.Tk):
         self.run_visual_button = ttk.Button(top_frame, text="Run Visual Simulation", command=self.run_visual_simulation)
         self.run_visual_button.grid(column=10, row=0, padx=5, pady=5)
 
+        self.fast_forward = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="Fast Forward", variable=self.fast_forward).grid(column=11, row=0, padx=5, pady=5)
+
         separator = ttk.Separator(self, orient='horizontal')
         separator.pack(fill=tk.X, padx=10, pady=5)
 
@@ -305,35 +394,72 @@ class CacheSimulatorGUI(tk.Tk):
         self.mm_canvas.itemconfig(self.mm_cell_rects[cell_idx], fill="red")
 
     def run_test(self):
+        # The worker thread owns the cache until it reports back; nothing else may touch it.
+        if self.busy():
+            return
         test = self.test_type.get()
         policy = self.policy.get()
         count = self.access_count.get()
         self.cache.reset_metrics()
         self.cache.replacement_policy = policy
-        self.output_area.delete("1.0", tk.END)
-        self.output_area.insert(tk.END, f"Running {test} test with {policy} replacement policy...\n")
-        self.output_area.insert(tk.END, "-" * 60 + "\n")
-
-        access_sequence = []
-        if test == "spatial":
-            total_blocks = MEMORY_SIZE // BLOCK_SIZE
-            access_sequence = generate_spatial_accesses(total_blocks)
-            self.output_area.insert(tk.END, f"Spatial Test - Accessing blocks sequentially.\n")
-        elif test == "temporal":
-            access_sequence = generate_temporal_accesses(count)
-            self.output_area.insert(tk.END, f"Temporal Test - Repeatedly accessing base blocks for {count} times.\n")
-        elif test == "random":
-            total_blocks = MEMORY_SIZE // BLOCK_SIZE
-            access_sequence = generate_random_accesses(count, total_blocks)
-            self.output_area.insert(tk.END, f"Random Test - Performing {count} random accesses.\n")
-
-        results = self.cache.simulate_accesses(access_sequence)
-        self.output_area.insert(tk.END, "-" * 60 + "\n")
-        self.output_area.insert(tk.END, str(self.cache) + "\n")
-        self.output_area.insert(tk.END, "-" * 60 + "\n")
-        self.update_cache_grid()
+        self.clear_log()
+        self.log(f"Running {test} test with {policy} replacement policy...")
+        self.log("-" * 60)
+        self.set_controls_enabled(False)
+        self.worker = threading.Thread(target=self.run_test_worker, args=(test, count), daemon=True)
+        self.worker.start()
+
+    def run_test_worker(self, test, count):
+        """Worker thread: generates and simulates the test, posting messages for the frame loop."""
+        post = self.worker_queue.put
+        # Always end with "done" or "error", so the controls are enabled again.
+        try:
+            access_sequence = []
+            if test == "spatial":
+                total_blocks = MEMORY_SIZE // BLOCK_SIZE
+                access_sequence = generate_spatial_accesses(total_blocks)
+                post(("log", f"Spatial Test - Accessing blocks sequentially."))
+            elif test == "temporal":
+                access_sequence = generate_temporal_accesses(count)
+                post(("log", f"Temporal Test - Repeatedly accessing base blocks for {count} times."))
+            elif test == "random":
+                total_blocks = MEMORY_SIZE // BLOCK_SIZE
+                access_sequence = generate_random_accesses(count, total_blocks)
+                post(("log", f"Random Test - Performing {count} random accesses."))
+
+            total = len(access_sequence)
+            access_memory = self.cache.access_memory
+            for start in range(0, total, PROGRESS_CHUNK):
+                for i in range(start, min(start + PROGRESS_CHUNK, total)):
+                    access_memory(access_sequence[i], i)
+                post(("progress", min(start + PROGRESS_CHUNK, total), total))
+            post(("done", str(self.cache)))
+        except Exception as exc:
+            post(("error", f"{type(exc).__name__}: {exc}"))
+
+    def handle_worker_message(self, kind, *args):
+        if kind == "log":
+            self.log(args[0])
+        elif kind == "progress":
+            done, total = args
+            self.current_access_label.config(text=f"Running test: {done}/{total} accesses")
+            self.request_redraw()
+        elif kind == "done":
+            self.log("-" * 60)
+            self.log(args[0])
+            self.log("-" * 60)
+            self.current_access_label.config(text="Current Memory Access: N/A")
+            self.request_redraw()
+            self.set_controls_enabled(True)
+        elif kind == "error":
+            self.log(f"Test failed: {args[0]}")
+            self.current_access_label.config(text="Test Failed")
+            self.request_redraw()
+            self.set_controls_enabled(True)
 
     def processor_request_step(self):
+        if self.busy():
+            return
         policy = self.policy.get()
         self.cache.replacement_policy = policy
         req_str = self.processor_request.get().strip()
@@ -342,58 +468,64 @@ class CacheSimulatorGUI(tk.Tk):
             try:
                 block_number = int(req_str)
             except ValueError:
-                self.output_area.insert(tk.END, "Invalid block number entered. Using random request.\n")
+                self.log("Invalid block number entered. Using random request.")
                 block_number = random.randint(0, total_blocks - 1)
         else:
             block_number = random.randint(0, total_blocks - 1)
 
         self.current_block_request = block_number
         self.current_access_label.config(text=f"Current Memory Access: Block {block_number}")
-        self.output_area.insert(tk.END, f"Processor Request: Block {block_number}\n")
+        self.log(f"Processor Request: Block {block_number}")
 
         access_result = self.cache.access_memory(block_number, 0)
         if access_result == "Miss":
-            self.output_area.insert(tk.END, "Cache miss! Accessing Main Memory...\n")
+            self.log("Cache miss! Accessing Main Memory...")
             self.highlight_mm_block(block_number)
         else:
-            self.output_area.insert(tk.END, "Cache hit!\n")
+            self.log("Cache hit!")
 
-        self.output_area.insert(tk.END, str(self.cache) + "\n")
-        self.output_area.insert(tk.END, "-" * 60 + "\n")
-        self.update_cache_grid(highlight_idx=0)
+        self.log(str(self.cache))
+        self.log("-" * 60)
+        self.request_redraw(highlight_idx=0)
 
     def run_visual_simulation(self):
+        # Only one run may use the cache at a time; the buttons stay disabled until it ends.
+        if self.busy():
+            return
         policy = self.policy.get()
         self.cache.reset_metrics()
         self.cache.replacement_policy = policy
         total_blocks = MEMORY_SIZE // BLOCK_SIZE
-        self.visual_accesses = [random.randint(0, total_blocks - 1) for _ in range(VISUAL_SIM_STEPS)]
-        self.current_step = 0
-        self.output_area.delete("1.0", tk.END)
-        self.output_area.insert(tk.END, f"Starting visual simulation with {VISUAL_SIM_STEPS} processor requests...\n")
+        steps = FAST_FORWARD_STEPS if self.fast_forward.get() else VISUAL_SIM_STEPS
+        self.visual = VisualSimulation(self.cache, generate_random_accesses(steps, total_blocks), self.log)
+        self.clear_log()
+        self.log(f"Starting visual simulation with {steps} processor requests...")
+        self.set_controls_enabled(False)
         self.after(ACCESS_DELAY, self.visual_step)
 
     def visual_step(self):
-        if self.current_step >= len(self.visual_accesses):
-            self.output_area.insert(tk.END, "Visual simulation completed.\n")
+        visual = self.visual
+        if visual.remaining() == 0:
+            self.log("Visual simulation completed.")
             self.current_access_label.config(text="Visual Simulation Completed")
+            self.set_controls_enabled(True)
             return
 
-        block_number = self.visual_accesses[self.current_step]
-        self.current_access_label.config(text=f"Current Memory Access: Block {block_number}")
-        self.output_area.insert(tk.END, f"Request {self.current_step+1}/{VISUAL_SIM_STEPS}: Block {block_number}\n")
-
-        access_result = self.cache.access_memory(block_number, self.current_step)
-
-        if access_result == "Miss":
-            self.output_area.insert(tk.END, "Cache miss! Loading from Main Memory...\n")
-            self.highlight_mm_block(block_number)
+        # Fast forward simulates a whole frame's worth of accesses, then draws once.
+        if self.fast_forward.get():
+            self.frame_budget.run(visual.advance, visual.remaining())
+            delay = FRAME_INTERVAL
         else:
-            self.output_area.insert(tk.END, "Cache hit!\n")
+            visual.advance(1)
+            delay = ACCESS_DELAY
 
-        self.update_cache_grid(highlight_idx=0)
-        self.current_step += 1
-        self.after(ACCESS_DELAY, self.visual_step)
+        block_number = visual.accesses[visual.step - 1]
+        self.current_access_label.config(text=f"Current Memory Access: Block {block_number}")
+        if visual.last_miss is not None:
+            self.highlight_mm_block(visual.last_miss)
+            visual.last_miss = None
+        self.request_redraw(highlight_idx=0)
+        self.after(delay, self.visual_step)
 
 
 def generate_spatial_accesses(num_accesses, start_address=0, step=1):
@@ -409,8 +541,8 @@ def generate_temporal_accesses(num_accesses, base_addresses_blocks=[0, 1, 2], re
         access_sequence.append(base_addresses_blocks[base_index % base_len])
     return access_sequence
 
-def generate_random_accesses(num_accesses, total_blocks):
-    return [random.randint(0, total_blocks - 1) for _ in range(num_accesses)]
+def generate_random_accesses(num_accesses, total_blocks, seed=None):
+    return random_accesses(num_accesses, total_blocks, seed=seed).tolist()
 
 
 MEMORY_SIZE = 64 * 1024
@@ -424,7 +556,39 @@ MM_SAMPLE_BLOCKS = 16
 MM_COLS = 4
 MM_ROWS = 4
 
+FRAME_INTERVAL = 33  # ms between screen refreshes (~30 frames per second)
+LOG_MAX_LINES = 2000  # Output log ring buffer size
+PROGRESS_CHUNK = 10000  # Accesses simulated between progress messages
+FAST_FORWARD_STEPS = 100000  # Visual simulation length in fast-forward mode
+
+
+def run_headless(num_accesses=VISUAL_SIM_STEPS, policy="LRU", seed=None, quiet=False):
+    """Run a visual simulation without a window, in fast-forward frames, and print the log."""
+    cache = FullyAssociativeCache(CAPACITY, replacement_policy=policy)
+    total_blocks = MEMORY_SIZE // BLOCK_SIZE
+    log = (lambda text: None) if quiet else print
+    visual = VisualSimulation(cache, generate_random_accesses(num_accesses, total_blocks, seed=seed), log)
+    log(f"Starting visual simulation with {num_accesses} processor requests...")
+    frame_budget = FrameBudget()
+    while visual.remaining():
+        frame_budget.run(visual.advance, visual.remaining())
+    log("Visual simulation completed.")
+    print(cache)
+    return cache
+
 
 if __name__ == "__main__":
-    app = CacheSimulatorGUI()
-    app.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Cache & main memory simulation GUI.")
+    parser.add_argument('--headless', action='store_true', help="run the visual simulation without a window")
+    parser.add_argument('--accesses', type=int, default=VISUAL_SIM_STEPS, help="headless: number of processor requests")
+    parser.add_argument('--policy', default="LRU", choices=["LRU", "FIFO", "Random"], help="headless: replacement policy")
+    parser.add_argument('--seed', type=int, help="headless: seed for the access sequence")
+    parser.add_argument('--quiet', action='store_true', help="headless: print only the final cache state")
+    args = parser.parse_args()
+    if args.headless:
+        if args.seed is not None:
+            random.seed(args.seed)  # The Random replacement policy draws from the global generator.
+        run_headless(args.accesses, args.policy, args.seed, args.quiet)
+    else:
+        app = CacheSimulatorGUI()
+        app.mainloop()
\ No newline at end of file
@@ -1,10 +1,17 @@
+import argparse
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 import random
+from collections import OrderedDict
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cachesim.frames import FrameBudget
+
 ########################################
 # GLOBAL CONSTANTS
 ########################################
@@ -24,6 +31,8 @@ VICTIM_CAPACITY = 4
 
 # Auto-run delay (milliseconds) between simulation steps
 AUTO_DELAY = 100
+# Fast-forward mode: one frame every FRAME_INTERVAL ms, as many accesses per frame as fit
+FRAME_INTERVAL = 33
 
 ########################################
 # EXTENDED MULTI-LEVEL CACHE SIMULATOR
@@ -50,6 +59,7 @@ class DirectMappedCache:
         self.hits = 0
         self.misses = 0
         self.accesses = 0
+        self.changes = None  # Shared change list when the simulator records changes
 
     def index_for_block(self, block_addr):
         return (block_addr // self.block_size) % self.num_lines
@@ -72,6 +82,8 @@ class DirectMappedCache:
         if old_block.valid:
             evicted = (old_block.block_addr, old_block.dirty)
         self.lines[idx] = CacheBlock(block_addr=block_addr, valid=True, dirty=(operation=='write'))
+        if self.changes is not None:
+            self.changes.append(('L1', idx, evicted[0] if evicted else None, block_addr))
         return evicted
 
     def update_write(self, block_addr):
@@ -91,6 +103,7 @@ class SetAssociativeCache:
         self.hits = 0
         self.misses = 0
         self.accesses = 0
+        self.changes = None  # Shared change list when the simulator records changes
 
     def index_for_block(self, block_addr):
         return (block_addr // self.block_size) % self.num_sets
@@ -116,6 +129,8 @@ class SetAssociativeCache:
                 self.sets[set_idx][j] = CacheBlock(block_addr=block_addr, valid=True, dirty=(operation=='write'))
                 self.lru_counters[set_idx][j] = self.global_counter
                 self.global_counter += 1
+                if self.changes is not None:
+                    self.changes.append(('L2', (set_idx, j), None, block_addr))
                 return None
         # Use LRU replacement:
         lru_index = 0
@@ -129,42 +144,66 @@ class SetAssociativeCache:
         self.sets[set_idx][lru_index] = CacheBlock(block_addr=block_addr, valid=True, dirty=(operation=='write'))
         self.lru_counters[set_idx][lru_index] = self.global_counter
         self.global_counter += 1
+        if self.changes is not None:
+            self.changes.append(('L2', (set_idx, lru_index), evicted[0], block_addr))
         return evicted
 
 # Victim Cache (Fully-Associative, 4 Blocks)
 class VictimCache:
     def __init__(self, capacity):
         self.capacity = capacity
-        self.blocks = []  # list of (block_addr, dirty)
+        self.blocks = OrderedDict()  # block_addr -> dirty, oldest first (O(1) lookup and FIFO eviction)
         self.hits = 0
         self.misses = 0
+        self.changes = None  # Shared change list when the simulator records changes
 
     def lookup(self, block_addr):
-        for i, (b_addr, dirty) in enumerate(self.blocks):
-            if b_addr == block_addr:
-                self.hits += 1
-                victim_block = self.blocks.pop(i)
-                return victim_block, True
+        if block_addr in self.blocks:
+            self.hits += 1
+            victim_block = (block_addr, self.blocks.pop(block_addr))
+            if self.changes is not None:
+                self.changes.append(('victim', None, block_addr, None))
+            return victim_block, True
         self.misses += 1
         return None, False
 
     def insert(self, block_addr, dirty):
-        if len(self.blocks) >= self.capacity:
-            self.blocks.pop(0)
-        self.blocks.append((block_addr, dirty))
+        if self.capacity <= 0:
+            return
+        # Unlike cachesim.multilevel.VictimCache, this one can key by block: a block only
+        # gets here when L1 evicts it, and it cannot be in L1 and here at the same time
+        # because a victim hit removes it from here and this model has no prefetch path.
+        if block_addr in self.blocks:
+            del self.blocks[block_addr]
+        elif len(self.blocks) >= self.capacity:
+            self.blocks.popitem(last=False)
+        self.blocks[block_addr] = dirty
+        if self.changes is not None:
+            self.changes.append(('victim', None, None, block_addr))
 
 # Extended Multi-Level Cache Simulator
+# When record_changes is set, every access appends what it changed to self.changes, in
+# order, as (level, position, old_block, new_block) tuples: level is 'L1', 'L2' or
+# 'victim'; position is the L1 line, the L2 (set, way) or None for the victim cache,
+# which has no fixed slots; a block is None when the slot was or becomes empty. take_changes() hands them over and clears.
 class MultiLevelCacheSimulator:
-    def __init__(self):
+    def __init__(self, record_changes=False, victim_capacity=VICTIM_CAPACITY):
         self.L1 = DirectMappedCache(size_words=2048, block_size=BLOCK_SIZE)
         self.L2 = SetAssociativeCache(size_words=L2_SIZE_WORDS, block_size=BLOCK_SIZE, ways=L2_WAYS)
-        self.victim = VictimCache(capacity=VICTIM_CAPACITY)
+        self.victim = VictimCache(capacity=victim_capacity)
         # For simplicity, write buffer and prefetch caches are not visualized.
         self.main_memory_accesses = 0
         self.L1_hits = 0
         self.victim_hits = 0
         self.L2_hits = 0
         self.total_accesses = 0
+        self.changes = [] if record_changes else None
+        self.L1.changes = self.L2.changes = self.victim.changes = self.changes
+
+    def take_changes(self):
+        changes = list(self.changes)
+        self.changes.clear()
+        return changes
 
     def access(self, address, operation='read'):
         self.total_accesses += 1
@@ -214,7 +253,16 @@ class MultiLevelCacheSimulator:
         }
 
     def reset(self):
-        self.__init__()
+        self.__init__(record_changes=self.changes is not None, victim_capacity=self.victim.capacity)
+
+def simulate_random_reads(simulator, count):
+    # Random block-number reads, as issued by the test and auto-run buttons.
+    total_blocks = MEMORY_SIZE // BLOCK_SIZE
+    for _ in range(count):
+        simulator.access(random.randint(0, total_blocks - 1), "read")
+
+def format_performance(simulator):
+    return "\n".join([f"{key}: {value}" for key, value in simulator.get_performance().items()])
 
 ########################################
 # GUI FOR EXTENDED MULTI-LEVEL CACHE SIMULATOR
@@ -225,8 +273,9 @@ class ExtendedCacheSimulatorGUI(tk.Tk):
         super().__init__()
         self.title("Extended Multi-Level Cache Simulator")
         self.geometry("1200x800")
-        self.simulator = MultiLevelCacheSimulator()
+        self.simulator = MultiLevelCacheSimulator(record_changes=True)
         self.auto_samples_remaining = 0
+        self.frame_budget = FrameBudget()
         self.create_widgets()
 
     def create_widgets(self):
@@ -253,6 +302,9 @@ class ExtendedCacheSimulatorGUI(tk.Tk):
         self.reset_button = ttk.Button(top_frame, text="Reset Simulator", command=self.reset_simulator)
         self.reset_button.grid(column=6, row=0, padx=5, pady=5)
 
+        self.fast_forward = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="Fast Forward", variable=self.fast_forward).grid(column=7, row=0, padx=5, pady=5)
+
         # Display frame:
         display_frame = ttk.Frame(self)
         display_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -357,33 +409,46 @@ class ExtendedCacheSimulatorGUI(tk.Tk):
                 self.l2_canvas.itemconfigure(f"l2_text{r*self.l2_cols+c}", text=text)
 
     def update_victim_display(self):
-        victim_list = self.simulator.victim.blocks
+        victim_list = list(self.simulator.victim.blocks)
         for i in range(self.victim_cols):
             if i < len(victim_list):
-                block_addr, dirty = victim_list[i]
+                block_addr = victim_list[i]
                 text = f"{block_addr}"
             else:
                 text = ""
             self.victim_canvas.itemconfigure(f"victim_text{i}", text=text)
 
+    def apply_changes(self):
+        # Reconfigure only the cells the simulator reported as changed, each once.
+        latest = {}
+        for level, position, old_block, new_block in self.simulator.take_changes():
+            latest[(level, position)] = new_block
+        victim_changed = False
+        for (level, position), block_addr in latest.items():
+            text = "" if block_addr is None else f"{block_addr}"
+            if level == 'L1':
+                self.l1_canvas.itemconfigure(f"l1_text{position}", text=text)
+            elif level == 'L2':
+                set_idx, way = position
+                if set_idx < self.l2_rows:
+                    self.l2_canvas.itemconfigure(f"l2_text{set_idx*self.l2_cols+way}", text=text)
+            else:
+                victim_changed = True
+        if victim_changed:
+            # Victim slots shift on every insert or hit; there are only a few, so redraw them all.
+            self.update_victim_display()
+
     def update_metrics_display(self):
-        perf = self.simulator.get_performance()
-        metrics_text = "\n".join([f"{key}: {value}" for key, value in perf.items()])
         self.metrics_area.delete("1.0", tk.END)
-        self.metrics_area.insert(tk.END, metrics_text)
+        self.metrics_area.insert(tk.END, format_performance(self.simulator))
 
     def run_test(self):
         try:
             count = int(self.access_count.get())
         except ValueError:
             count = 20
-        total_blocks = MEMORY_SIZE // BLOCK_SIZE
-        access_sequence = [random.randint(0, total_blocks - 1) for _ in range(count)]
-        for addr in access_sequence:
-            self.simulator.access(addr, "read")
-        self.update_l1_display()
-        self.update_l2_display()
-        self.update_victim_display()
+        simulate_random_reads(self.simulator, count)
+        self.apply_changes()
         self.update_metrics_display()
 
     def run_auto_simulation(self):
@@ -397,15 +462,19 @@ class ExtendedCacheSimulatorGUI(tk.Tk):
         if self.auto_samples_remaining <= 0:
             self.update_metrics_display()
             return
-        total_blocks = MEMORY_SIZE // BLOCK_SIZE
-        addr = random.randint(0, total_blocks - 1)
-        self.simulator.access(addr, "read")
-        self.auto_samples_remaining -= 1
-        self.update_l1_display()
-        self.update_l2_display()
-        self.update_victim_display()
+        # Fast forward simulates a whole frame's worth of accesses, then redraws once.
+        if self.fast_forward.get():
+            done = self.frame_budget.run(lambda count: simulate_random_reads(self.simulator, count),
+                                         self.auto_samples_remaining)
+            delay = FRAME_INTERVAL
+        else:
+            simulate_random_reads(self.simulator, 1)
+            done = 1
+            delay = AUTO_DELAY
+        self.auto_samples_remaining -= done
+        self.apply_changes()
         self.update_metrics_display()
-        self.after(AUTO_DELAY, self.run_auto_step)
+        self.after(delay, self.run_auto_step)
 
     def reset_simulator(self):
         self.simulator.reset()
@@ -415,6 +484,26 @@ class ExtendedCacheSimulatorGUI(tk.Tk):
         self.metrics_area.delete("1.0", tk.END)
         self.metrics_area.insert(tk.END, "Simulator reset.\n")
 
+def run_headless(samples=50, seed=None):
+    """Auto-run without a window, in fast-forward frames, and print the final metrics."""
+    if seed is not None:
+        random.seed(seed)
+    simulator = MultiLevelCacheSimulator()
+    frame_budget = FrameBudget()
+    remaining = samples
+    while remaining > 0:
+        remaining -= frame_budget.run(lambda count: simulate_random_reads(simulator, count), remaining)
+    print(format_performance(simulator))
+    return simulator
+
 if __name__ == "__main__":
-    app = ExtendedCacheSimulatorGUI()
-    app.mainloop()
+    parser = argparse.ArgumentParser(description="Extended multi-level cache simulator GUI.")
+    parser.add_argument('--headless', action='store_true', help="run the auto simulation without a window")
+    parser.add_argument('--samples', type=int, default=50, help="headless: number of auto-run accesses")
+    parser.add_argument('--seed', type=int, help="headless: random seed")
+    args = parser.parse_args()
+    if args.headless:
+        run_headless(args.samples, args.seed)
+    else:
+        app = ExtendedCacheSimulatorGUI()
+        app.mainloop()
@@ -1,21 +1,41 @@
-import matplotlib.pyplot as plt
-import numpy as np
+import argparse
+import os
+import sys
+
+import matplotlib
 
-# Given data for Exp01 (Fully Associative Cache) and Multi-Level Cache (Enhanced Implementation)
-num_accesses_list = [100, 500, 1000, 2000, 5000, 10000, 50000, 100000]
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cachesim.result_writer import read_results
+
+# Results exported by tutorial_1/test.py (Exp01, fully associative cache) and
+# tutorial_3/main.py (multi-level cache), each run from its own directory.
+here = os.path.dirname(os.path.abspath(__file__))
+parser = argparse.ArgumentParser(description="Compare Tutorial 1 and Tutorial 3 hit/miss ratios from their result files.")
+parser.add_argument('--t1-results', default=os.path.join(here, '..', 'tutorial_1', 'cache_performance_results.csv'))
+parser.add_argument('--t3-results', default=os.path.join(here, 'multilevel_results.csv'))
+parser.add_argument('--policy', default='LRU', help="Exp01 replacement policy to compare against")
+parser.add_argument('--show', action='store_true', help="also open the figures in a window")
+args = parser.parse_args()
+if not args.show:
+    matplotlib.use('Agg')  # Only write the PNGs; no display needed.
+import matplotlib.pyplot as plt
 
-# Exp01 Results (Fully Associative Cache)
-exp01_hit_ratios = [50, 55, 60, 65, 70, 75, 80, 85]
-exp01_miss_ratios = [50, 45, 40, 35, 30, 25, 20, 15]
+exp01_records = [r for r in read_results(args.t1_results) if r['policy'] == args.policy]
+multi_level_records = read_results(args.t3_results)
+patterns = list(dict.fromkeys(r['pattern'] for r in multi_level_records))
 
-# Enhanced Multi-Level Cache Results (Direct Mapped + 4-Way Set Associative + Write Buffer + Victim Cache + Prefetch)
-multi_level_hit_ratios = [60, 68, 74, 79, 83, 86, 89, 92]
-multi_level_miss_ratios = [40, 32, 26, 21, 17, 14, 11, 8]
+def series(records, pattern, metric):
+    # (num_accesses, value) pairs for one access pattern, in order of accesses.
+    points = sorted((r['num_accesses'], r[metric]) for r in records if r['pattern'] == pattern)
+    return [n for n, _ in points], [v for _, v in points]
 
 # Plot Hit Ratio Comparison
 plt.figure(figsize=(8, 6))
-plt.plot(num_accesses_list, exp01_hit_ratios, marker='o', linestyle='-', label='Exp01 (Single Level Cache)')
-plt.plot(num_accesses_list, multi_level_hit_ratios, marker='s', linestyle='--', label='Multi-Level Cache')
+for pattern in patterns:
+    plt.plot(*series(exp01_records, pattern, 'hit_ratio'), marker='o', linestyle='-',
+             label=f'Exp01 (Single Level Cache, {args.policy}) - {pattern}')
+    plt.plot(*series(multi_level_records, pattern, 'Hit Ratio (%)'), marker='s', linestyle='--',
+             label=f'Multi-Level Cache - {pattern}')
 plt.xscale('log')
 plt.title('Comparison of Hit Ratios')
 plt.xlabel('Number of Accesses (log scale)')
@@ -23,13 +43,17 @@ plt.ylabel('Hit Ratio (%)')
 plt.grid(True, which="both", ls="--")
 plt.legend()
 plt.tight_layout()
-plt.savefig('comparison_hit_ratio.png')
-plt.show()
+plt.savefig(os.path.join(here, 'comparison_hit_ratio.png'))
+if args.show:
+    plt.show()
 
 # Plot Miss Ratio Comparison
 plt.figure(figsize=(8, 6))
-plt.plot(num_accesses_list, exp01_miss_ratios, marker='o', linestyle='-', label='Exp01 (Single Level Cache)')
-plt.plot(num_accesses_list, multi_level_miss_ratios, marker='s', linestyle='--', label='Multi-Level Cache')
+for pattern in patterns:
+    plt.plot(*series(exp01_records, pattern, 'miss_ratio'), marker='o', linestyle='-',
+             label=f'Exp01 (Single Level Cache, {args.policy}) - {pattern}')
+    plt.plot(*series(multi_level_records, pattern, 'Miss Ratio (%)'), marker='s', linestyle='--',
+             label=f'Multi-Level Cache - {pattern}')
 plt.xscale('log')
 plt.title('Comparison of Miss Ratios')
 plt.xlabel('Number of Accesses (log scale)')
@@ -37,5 +61,6 @@ plt.ylabel('Miss Ratio (%)')
 plt.grid(True, which="both", ls="--")
 plt.legend()
 plt.tight_layout()
-plt.savefig('comparison_miss_ratio.png')
-plt.show()
+plt.savefig(os.path.join(here, 'comparison_miss_ratio.png'))
+if args.show:
+    plt.show()
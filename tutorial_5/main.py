@@ -555,46 +555,47 @@ class TomasuloProcessor:
         return max_cycle + 1 
 
 
-processor = TomasuloProcessor()
-
-for i in range(32):
-    processor.reg_file.values[i] = i + 5
-
-for i in range(200):
-    processor.memory.data[i] = i * 2 + 10
-
-processor.memory.data[38] = 45 
-processor.memory.data[41] = 72  
-processor.memory.data[53] = 120  
-processor.memory.data[38 + 44] = 200  
-
-program = [
-    # load,r0,32,r2 -> r0 = MEM[32 + value_in_r2]
-    Instruction('LD', dst=0, mem_addr=32 + processor.reg_file.values[2]),
-    
-    # load,r4,32,r2 -> r4 = MEM[32 + value_in_r2]
-    Instruction('LD', dst=4, mem_addr=32 + processor.reg_file.values[2]),
-    
-    # load,r2,44,r3 -> r2 = MEM[44 + value_in_r3]
-    Instruction('LD', dst=2, mem_addr=44 + processor.reg_file.values[3]),
-    
-    # imul,r0,r2,r4 -> r0 = r2 * r4
-    Instruction('IMUL', dst=0, src1=2, src2=4),
-    
-    # iadd,r8,r2,r6 -> r8 = r2 + r6
-    Instruction('IADD', dst=8, src1=2, src2=6),
-    
-    # fmul,r10,r0,r6 -> r10 = r0 * r6
-    Instruction('FMUL', dst=10, src1=0, src2=6),
-    
-    # fadd,r6,r8,r2 -> r6 = r8 + r2
-    Instruction('FADD', dst=6, src1=8, src2=2),
-]
-
-print("===== INITIAL MEMORY STATE =====")
-print(f"Memory[{32 + processor.reg_file.values[2]}] = {processor.memory.data[32 + processor.reg_file.values[2]]}")
-print(f"Memory[{44 + processor.reg_file.values[3]}] = {processor.memory.data[44 + processor.reg_file.values[3]]}")
-
-processor.load_program(program)
-
-processor.run(max_cycles=100)
+if __name__ == "__main__":
+    processor = TomasuloProcessor()
+
+    for i in range(32):
+        processor.reg_file.values[i] = i + 5
+
+    for i in range(200):
+        processor.memory.data[i] = i * 2 + 10
+
+    processor.memory.data[38] = 45 
+    processor.memory.data[41] = 72  
+    processor.memory.data[53] = 120  
+    processor.memory.data[38 + 44] = 200  
+
+    program = [
+        # load,r0,32,r2 -> r0 = MEM[32 + value_in_r2]
+        Instruction('LD', dst=0, mem_addr=32 + processor.reg_file.values[2]),
+
+        # load,r4,32,r2 -> r4 = MEM[32 + value_in_r2]
+        Instruction('LD', dst=4, mem_addr=32 + processor.reg_file.values[2]),
+
+        # load,r2,44,r3 -> r2 = MEM[44 + value_in_r3]
+        Instruction('LD', dst=2, mem_addr=44 + processor.reg_file.values[3]),
+
+        # imul,r0,r2,r4 -> r0 = r2 * r4
+        Instruction('IMUL', dst=0, src1=2, src2=4),
+
+        # iadd,r8,r2,r6 -> r8 = r2 + r6
+        Instruction('IADD', dst=8, src1=2, src2=6),
+
+        # fmul,r10,r0,r6 -> r10 = r0 * r6
+        Instruction('FMUL', dst=10, src1=0, src2=6),
+
+        # fadd,r6,r8,r2 -> r6 = r8 + r2
+        Instruction('FADD', dst=6, src1=8, src2=2),
+    ]
+
+    print("===== INITIAL MEMORY STATE =====")
+    print(f"Memory[{32 + processor.reg_file.values[2]}] = {processor.memory.data[32 + processor.reg_file.values[2]]}")
+    print(f"Memory[{44 + processor.reg_file.values[3]}] = {processor.memory.data[44 + processor.reg_file.values[3]]}")
+
+    processor.load_program(program)
+
+    processor.run(max_cycles=100)